@@ -0,0 +1,32 @@
+"""Add book_cards table
+
+Revision ID: 4b7e2a91c0d3
+Revises: 8d2f1c7a9b4e
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a91c0d3'
+down_revision: Union[str, None] = '8d2f1c7a9b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Карточки заполняются командой `python cli.py rebuild-book-cards` или при первом чтении
+    op.create_table('book_cards',
+    sa.Column('id_book', sa.Integer(), nullable=False),
+    sa.Column('document', sa.TEXT(), nullable=False),
+    sa.ForeignKeyConstraint(['id_book'], ['books.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id_book')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('book_cards')
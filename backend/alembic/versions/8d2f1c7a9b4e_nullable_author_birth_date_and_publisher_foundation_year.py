@@ -0,0 +1,37 @@
+"""Nullable author birth_date and publisher foundation_year
+
+Revision ID: 8d2f1c7a9b4e
+Revises: 565836f737dc
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f1c7a9b4e'
+down_revision: Union[str, None] = '565836f737dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Авторы и издательства, созданные массовым импортом по имени, могут быть без дат
+    op.alter_column('authors', 'birth_date',
+               existing_type=sa.DATE(),
+               nullable=True)
+    op.alter_column('publishers', 'foundation_year',
+               existing_type=sa.Integer(),
+               nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('publishers', 'foundation_year',
+               existing_type=sa.Integer(),
+               nullable=False)
+    op.alter_column('authors', 'birth_date',
+               existing_type=sa.DATE(),
+               nullable=False)
@@ -0,0 +1,37 @@
+"""Add overdue_orders table and orders(status, due_date) index
+
+Revision ID: 9c3e5f1a7b2d
+Revises: 4b7e2a91c0d3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5f1a7b2d'
+down_revision: Union[str, None] = '4b7e2a91c0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_orders_status_due_date', 'orders', ['status', 'due_date'])
+    op.create_table('overdue_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id_user', sa.Integer(), nullable=False),
+    sa.Column('id_book', sa.Integer(), nullable=False),
+    sa.Column('due_date', sa.DATE(), nullable=False),
+    sa.Column('days_overdue', sa.Integer(), nullable=False),
+    sa.Column('scanned_at', sa.DATETIME(), nullable=False),
+    sa.ForeignKeyConstraint(['id'], ['orders.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('overdue_orders')
+    op.drop_index('ix_orders_status_due_date', table_name='orders')
@@ -0,0 +1,58 @@
+"""Add secondary indexes for hot lookups and unique users.email
+
+Revision ID: b6f0d2e8c4a1
+Revises: 9c3e5f1a7b2d
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f0d2e8c4a1'
+down_revision: Union[str, None] = '9c3e5f1a7b2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя, таблица, колонки); проверка планов - `python -m benchmarks.explain`
+INDEXES = [
+    ('ix_orders_id_user_status', 'orders', ['id_user', 'status']),
+    ('ix_orders_id_book_status', 'orders', ['id_book', 'status']),
+    ('ix_orders_order_date', 'orders', ['order_date']),
+    ('ix_books_isbn', 'books', ['ISBN']),
+    ('ix_books_id_publisher', 'books', ['id_publisher']),
+    ('ix_author_books_id_book', 'author_books', ['id_book', 'id_author']),
+    ('ix_genre_books_id_book', 'genre_books', ['id_book', 'id_genre']),
+    ('ix_authors_name', 'authors', ['name']),
+    ('ix_genres_name', 'genres', ['name']),
+    ('ix_publishers_name', 'publishers', ['name']),
+]
+# MySQL удаляет автоматический индекс внешнего ключа, когда его берёт на себя индекс из INDEXES
+# с той же первой колонкой. При откате индексы внешних ключей создаются заново до удаления
+FK_INDEXES = [
+    ('fk_orders_id_user', 'orders', ['id_user']),
+    ('fk_orders_id_book', 'orders', ['id_book']),
+    ('fk_books_id_publisher', 'books', ['id_publisher']),
+    ('fk_author_books_id_book', 'author_books', ['id_book']),
+    ('fk_genre_books_id_book', 'genre_books', ['id_book']),
+]
+
+
+def upgrade() -> None:
+    # Уникальный индекс не создастся, если в users уже есть повторяющиеся email -
+    # такие записи нужно объединить до миграции
+    op.create_index('ux_users_email', 'users', ['email'], unique=True)
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'mysql':
+        for name, table, columns in FK_INDEXES:
+            op.create_index(name, table, columns)
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_index('ux_users_email', table_name='users')
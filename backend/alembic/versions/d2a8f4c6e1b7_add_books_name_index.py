@@ -0,0 +1,27 @@
+"""Add books(name) index for keyset pagination by name
+
+Revision ID: d2a8f4c6e1b7
+Revises: b6f0d2e8c4a1
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f4c6e1b7'
+down_revision: Union[str, None] = 'b6f0d2e8c4a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Каталог сортируется по названию (?sort=name): страница читается по индексу, без filesort
+    op.create_index('ix_books_name', 'books', ['name'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_name', table_name='books')
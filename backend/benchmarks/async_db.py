@@ -0,0 +1,129 @@
+"""
+Пропускная способность конкурентных запросов к API при разных режимах работы с БД.
+
+    python -m benchmarks.async_db --books 5000 --requests 400 --concurrency 10
+
+Режимы:
+  blocking   - синхронная Session вызывается прямо в event loop (поведение до AsyncIREpository)
+  threadpool - синхронная Session через AsyncIREpository в пуле потоков (DB_ASYNC=false)
+  async      - AsyncSession через AsyncIREpository (DB_ASYNC=true)
+
+В режиме blocking конкурентность выше размера пула соединений может зависнуть: ожидание
+соединения блокирует event loop, который должен его освободить.
+
+По умолчанию используется временная SQLite-база (sqlite + aiosqlite), DATABASE_URL и
+ASYNC_DATABASE_URL можно передать через окружение, чтобы прогнать тот же сценарий на MySQL.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date
+from benchmarks.common import configure_env, percentile, LoopLagMonitor
+
+MODES = ('blocking', 'threadpool', 'async')
+
+
+def seed(books: int):
+    from config.database import Base, engine, SessionLocal
+    from models import Book, Author, AuthorBook, Genre, GenreBook, Publisher
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add_all([Publisher(id=i, name=f'Publisher {i}', description='', foundation_year=1900) for i in range(1, 21)])
+        db.add_all([Author(id=i, name=f'Author {i}', birth_date=date(1900, 1, 1), bio='') for i in range(1, 201)])
+        db.add_all([Genre(id=i, name=f'Genre {i}') for i in range(1, 21)])
+        db.flush()
+        db.add_all([Book(id=i, name=f'Book {i}', description='', id_publisher=i % 20 + 1,
+                         year=2000, ISBN=str(i), count=5) for i in range(1, books + 1)])
+        db.flush()
+        db.add_all([AuthorBook(id_author=i % 200 + 1, id_book=i) for i in range(1, books + 1)])
+        db.add_all([GenreBook(id_genre=i % 20 + 1, id_book=i) for i in range(1, books + 1)])
+        db.commit()
+
+
+async def measure(mode: str, requests: int, concurrency: int, path: str) -> dict:
+    import httpx
+    from main import app
+    from config.database import get_db, get_session
+    from utils.abstract_repository import AsyncIREpository
+
+    original_run = AsyncIREpository.run
+    app.dependency_overrides.clear()
+    if mode != 'async':
+        app.dependency_overrides[get_db] = get_session
+    if mode == 'blocking':
+        async def run(self, method, *args, **kwargs):
+            return method(*args, **kwargs)
+        AsyncIREpository.run = run
+
+    monitor = LoopLagMonitor()
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            await client.get(path)
+
+            async def one():
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+
+            monitor.start()
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(requests)))
+            elapsed = time.perf_counter() - started
+            await monitor.stop()
+    finally:
+        AsyncIREpository.run = original_run
+        app.dependency_overrides.clear()
+
+    latencies.sort()
+    return {
+        'mode': mode,
+        'requests': requests,
+        'concurrency': concurrency,
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        **monitor.result(),
+    }
+
+
+async def measure_all(modes, requests: int, concurrency: int, path: str) -> list:
+    # Все режимы в одном event loop: соединения асинхронного движка привязаны к нему
+    from config.database import async_engine
+    try:
+        return [await measure(mode, requests, concurrency, path) for mode in modes]
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--path', default='/api/books/?limit=100')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    configure_env()
+    seed(args.books)
+    results = asyncio.run(measure_all(args.modes, args.requests, args.concurrency, args.path))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<12}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'lag max ms':>12}{'lag mean ms':>13}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['loop_lag_max_ms']:>12}{r['loop_lag_mean_ms']:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def configure_env(db_async: bool = True):
+    # По умолчанию - временная SQLite-база; DATABASE_URL/ASYNC_DATABASE_URL из окружения имеют приоритет
+    if 'DATABASE_URL' not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+        os.environ['ASYNC_DATABASE_URL'] = f'sqlite+aiosqlite:///{path}'
+    os.environ['DB_ASYNC'] = 'true' if db_async else 'false'
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key-benchmark-secret')
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LoopLagMonitor:
+    # Задержка event loop: насколько опаздывает таймер с заданным периодом
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags = []
+        self.task = None
+        self.stopped = asyncio.Event()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while not self.stopped.is_set():
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(loop.time() - start - self.interval)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.stopped.set()
+        await self.task
+
+    def result(self) -> dict:
+        return {
+            'loop_lag_max_ms': round(max(self.lags, default=0) * 1000, 2),
+            'loop_lag_mean_ms': round(statistics.fmean(self.lags) * 1000, 2) if self.lags else 0.0,
+        }
@@ -0,0 +1,51 @@
+"""
+Отчёт о планах горячих запросов: те же сценарии, что в tests/test_query_plans.py (регрессию
+ловит pytest), но на базе заданного размера и с выводом планов в JSON.
+Код возврата 1, если какой-то запрос читает таблицу целиком.
+
+    python -m benchmarks.explain --books 2000
+
+По умолчанию используется временная SQLite-база (EXPLAIN QUERY PLAN, полный просмотр -
+строка "SCAN <таблица>" без индекса). Через DATABASE_URL проверяется MySQL (EXPLAIN,
+полный просмотр - type = ALL). Таблицы заполняются заново, поэтому боевую базу не указывать.
+"""
+import argparse
+import json
+import sys
+from datetime import date, datetime
+from benchmarks.common import configure_env
+
+
+def json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=2000, help='orders = books * 10, users = books / 4')
+    parser.add_argument('--verbose', action='store_true', help='print plans of all statements, not only failing')
+    args = parser.parse_args()
+
+    configure_env(db_async=False)
+    from config.database import engine
+    from tests.test_query_plans import check, seed
+    seed(args.books)
+    report = check(args.books)
+    failures = {name: [entry for entry in entries if entry['full_scans']] for name, entries in report.items()}
+    failures = {name: entries for name, entries in failures.items() if entries}
+    summary = {
+        'dialect': engine.dialect.name,
+        'scenarios': len(report),
+        'statements': sum(len(entries) for entries in report.values()),
+        'failures': failures,
+    }
+    if args.verbose:
+        summary['report'] = report
+    print(json.dumps(summary, indent=2, ensure_ascii=False, default=json_default))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
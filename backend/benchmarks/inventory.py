@@ -0,0 +1,150 @@
+"""
+Стресс-тест выдачи книг: много одновременных переводов заказов в CHECKED_OUT на одну книгу.
+
+    python -m benchmarks.inventory --copies 5 --orders 300 --concurrency 100
+
+Проверяется, что выдано ровно --copies экземпляров, остальные запросы получили 409,
+остаток не ушёл в минус, а повторная одновременная отправка одного и того же перехода
+(RETURNED) возвращает экземпляр один раз. При нарушении скрипт завершается с кодом 1.
+
+По умолчанию используется временная SQLite-база, через DATABASE_URL/ASYNC_DATABASE_URL
+сценарий можно прогнать на MySQL. --sync - синхронная Session в пуле потоков (DB_ASYNC=false).
+SQLite блокирует базу целиком, поэтому с --sync и высокой конкурентностью часть запросов
+получает 500 (database is locked) - это считается ошибкой прогона, хотя оверселла нет.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+from benchmarks.common import configure_env, percentile
+
+BOOK_ID = 1
+
+
+def seed(copies: int, orders: int):
+    from config.database import Base, engine, SessionLocal
+    from models import Book, Order, Publisher, User
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    today = date.today()
+    with SessionLocal() as db:
+        db.add(Publisher(id=1, name='Publisher', description='', foundation_year=1900))
+        db.add(User(id=1, name='Librarian', role='ADMIN', email='librarian@school.com', password='-'))
+        db.flush()
+        db.add(Book(id=BOOK_ID, name='Book', description='', id_publisher=1, year=2000, ISBN='1', count=copies))
+        db.flush()
+        db.add_all([Order(id=i, id_user=1, id_book=BOOK_ID, order_date=today, due_date=today + timedelta(days=14),
+                          status='PROCESSING') for i in range(1, orders + 1)])
+        db.commit()
+
+
+def book_count() -> int:
+    from config.database import SessionLocal
+    from models import Book
+    with SessionLocal() as db:
+        return db.get(Book, BOOK_ID).count
+
+
+def checked_out_order() -> int:
+    from config.database import SessionLocal
+    from models import Order
+    with SessionLocal() as db:
+        return db.query(Order.id).filter(Order.status == 'CHECKED_OUT').first().id
+
+
+async def put_statuses(client, headers, order_ids, status: str, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    codes = Counter()
+    latencies = []
+
+    async def one(order_id):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.put(f'/api/orders/{order_id}', json={'status': status}, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            codes[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(order_id) for order_id in order_ids))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'status': status,
+        'requests': len(order_ids),
+        'codes': dict(codes),
+        'rps': round(len(order_ids) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+async def run(copies: int, orders: int, concurrency: int) -> dict:
+    import httpx
+    from config.database import async_engine
+    from main import app
+    from models import User
+    from service.auth import AuthService
+
+    token = AuthService(user_repository=None).gen_token(User(id=1, role='ADMIN'))
+    headers = {'Authorization': f'Bearer {token}'}
+    # Ошибки приложения считаются как 500, а не прерывают весь прогон
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=60) as client:
+            checkout = await put_statuses(client, headers, range(1, orders + 1), 'CHECKED_OUT', concurrency)
+            count_after_checkout = book_count()
+            # Один и тот же возврат выданного заказа отправляется одновременно много раз
+            returned_id = checked_out_order()
+            duplicate = await put_statuses(client, headers, [returned_id] * concurrency, 'RETURNED', concurrency)
+            count_after_return = book_count()
+    finally:
+        if async_engine is not None:
+            await async_engine.dispose()
+    return {
+        'copies': copies,
+        'checkout': checkout,
+        'count_after_checkout': count_after_checkout,
+        'duplicate_return': duplicate,
+        'count_after_return': count_after_return,
+    }
+
+
+def check(result: dict) -> list:
+    errors = []
+    issued = result['checkout']['codes'].get(200, 0)
+    if issued != result['copies']:
+        errors.append(f"issued {issued} copies, expected {result['copies']}")
+    if result['count_after_checkout'] != 0:
+        errors.append(f"count after checkout is {result['count_after_checkout']}, expected 0")
+    # Повторы того же перехода проходят без изменений, но экземпляр возвращается один раз
+    if result['count_after_return'] != 1:
+        errors.append(f"count after duplicate returns is {result['count_after_return']}, expected 1")
+    for phase in ('checkout', 'duplicate_return'):
+        if any(code >= 500 for code in result[phase]['codes']):
+            errors.append(f'server errors during {phase}')
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--copies', type=int, default=5)
+    parser.add_argument('--orders', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--sync', action='store_true', help='use the sync Session in the threadpool')
+    args = parser.parse_args()
+
+    configure_env(db_async=not args.sync)
+    seed(args.copies, args.orders)
+    result = asyncio.run(run(args.copies, args.orders, args.concurrency))
+    errors = check(result)
+    result['errors'] = errors
+    print(json.dumps(result, indent=2))
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Нагрузочный прогон HTTP API на большом синтетическом наборе данных.
+
+    python -m benchmarks.load --scale 0.1 --requests 500 --concurrency 20 --output load.json
+    python -m benchmarks.load --skip-seed --baseline load.json
+
+Запросы идут в настоящий main.app (в процессе через httpx.ASGITransport) или, с --url,
+в запущенный сервер - тогда SECRET_KEY сервера должен совпадать с окружением скрипта.
+По каждому эндпоинту: число запросов, коды ответов, rps, p50/p95/p99. Результат - JSON
+с коммитом и параметрами прогона, чтобы сравнивать релизы между собой.
+
+Размер данных по умолчанию: 100k книг, 20k пользователей, 1M заказов (--scale уменьшает
+всё пропорционально). По умолчанию - временная SQLite-база; DATABASE_URL/ASYNC_DATABASE_URL
+подключают MySQL. --skip-seed использует уже заполненную базу (с тем же --scale). С --baseline
+p95 каждого эндпоинта сравнивается с прошлым прогоном, при замедлении больше --tolerance
+код выхода 1.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from benchmarks.common import configure_env, percentile
+
+SEED_CHUNK = 10000
+STATUSES = ('PROCESSING', 'READY_FOR_PICKUP', 'CHECKED_OUT', 'RETURNED', 'CANCELLED')
+
+
+def dataset_size(scale: float) -> dict:
+    size = lambda n: max(int(n * scale), 10)
+    return {
+        'books': size(100_000),
+        'users': size(20_000),
+        'orders': size(1_000_000),
+        'authors': size(20_000),
+        'genres': 50,
+        'publishers': size(1_000),
+        'school_classes': 40,
+    }
+
+
+def insert_chunks(db, model, rows):
+    from sqlalchemy import insert
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == SEED_CHUNK:
+            db.execute(insert(model), chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(model), chunk)
+
+
+def seed(size: dict):
+    from config.database import Base, engine, SessionLocal
+    from crud import BookCardRepository
+    from models import Author, AuthorBook, Book, BookCard, Genre, GenreBook, Order, Publisher, SchoolClass, User
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rnd = random.Random(1)
+    today = date.today()
+    books, users = size['books'], size['users']
+    with SessionLocal() as db:
+        insert_chunks(db, SchoolClass, ({'id': i, 'name': f'Class {i}'} for i in range(1, size['school_classes'] + 1)))
+        insert_chunks(db, Publisher, ({'id': i, 'name': f'Publisher {i}', 'description': 'Publisher description',
+                                       'foundation_year': 1900 + i % 120} for i in range(1, size['publishers'] + 1)))
+        insert_chunks(db, Author, ({'id': i, 'name': f'Author {i}', 'bio': 'Author biography',
+                                    'birth_date': date(1900 + i % 100, i % 12 + 1, 1)} for i in range(1, size['authors'] + 1)))
+        insert_chunks(db, Genre, ({'id': i, 'name': f'Genre {i}'} for i in range(1, size['genres'] + 1)))
+        # Пароль никому не нужен: токены выписываются скриптом напрямую
+        insert_chunks(db, User, ({'id': i, 'name': f'User {i}', 'email': f'user{i}@school.com', 'password': '-',
+                                  'role': 'ADMIN' if i == 1 else 'USER',
+                                  'id_school_class': i % size['school_classes'] + 1} for i in range(1, users + 1)))
+        insert_chunks(db, Book, ({'id': i, 'name': f'Book {i}', 'description': 'Book description ' * 10,
+                                  'id_publisher': rnd.randint(1, size['publishers']), 'year': 1950 + i % 75,
+                                  'ISBN': f'978-{i:09}', 'count': rnd.randint(0, 10)} for i in range(1, books + 1)))
+        insert_chunks(db, AuthorBook, ({'id_author': author, 'id_book': i} for i in range(1, books + 1)
+                                       for author in {rnd.randint(1, size['authors']) for _ in range(rnd.randint(1, 2))}))
+        insert_chunks(db, GenreBook, ({'id_genre': genre, 'id_book': i} for i in range(1, books + 1)
+                                      for genre in {rnd.randint(1, size['genres']) for _ in range(rnd.randint(1, 3))}))
+
+        def order(i: int) -> dict:
+            order_date = today - timedelta(days=rnd.randint(0, 730))
+            status = rnd.choice(STATUSES)
+            checked_out = status in ('CHECKED_OUT', 'RETURNED')
+            return {
+                'id': i, 'id_user': rnd.randint(1, users), 'id_book': rnd.randint(1, books),
+                'order_date': order_date, 'due_date': order_date + timedelta(days=14),
+                'checkout_date': order_date if checked_out else None,
+                'return_date': order_date + timedelta(days=rnd.randint(1, 30)) if status == 'RETURNED' else None,
+                'status': status,
+            }
+        insert_chunks(db, Order, (order(i) for i in range(1, size['orders'] + 1)))
+        db.commit()
+        # Карточки каталога собираются заранее, иначе первые запросы измеряют их сборку
+        BookCardRepository(BookCard, db).rebuild()
+
+
+def endpoints(size: dict) -> dict:
+    # Имя -> (функция пути, токен администратора или пользователя)
+    return {
+        'books': (lambda rnd: '/api/books/?limit=50', False),
+        'books_by_genre': (lambda rnd: f"/api/books/?limit=50&id_genre={rnd.randint(1, size['genres'])}", False),
+        'book': (lambda rnd: f"/api/books/{rnd.randint(1, size['books'])}", False),
+        'authors': (lambda rnd: '/api/authors/?limit=50', False),
+        'author': (lambda rnd: f"/api/authors/{rnd.randint(1, size['authors'])}", False),
+        'genres': (lambda rnd: '/api/genres/', False),
+        'publishers': (lambda rnd: '/api/publishers/?limit=50', False),
+        'orders_user': (lambda rnd: '/api/orders/?limit=50', False),
+        'orders_admin': (lambda rnd: '/api/orders/?limit=50&status=CHECKED_OUT', True),
+        'order': (lambda rnd: f"/api/orders/{rnd.randint(1, size['orders'])}", True),
+    }
+
+
+def tokens(users: int, count: int = 50) -> tuple[str, list[str]]:
+    from models import User
+    from service.auth import AuthService
+    service = AuthService(user_repository=None)
+    admin = service.gen_token(User(id=1, role='ADMIN'))
+    # Несколько разных пользователей, чтобы не мерить только попадания в кэш одного токена
+    return admin, [service.gen_token(User(id=i, role='USER')) for i in range(2, min(users, count + 1) + 1)]
+
+
+async def measure(client, path_for, token_for, requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    rnd = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+    codes = Counter()
+    latencies = []
+
+    async def one(record: bool):
+        path, token = path_for(rnd), token_for(rnd)
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers={'Authorization': f'Bearer {token}'})
+                code = response.status_code
+            except Exception as e:
+                code = type(e).__name__
+            elapsed = time.perf_counter() - start
+        if record:
+            codes[code] += 1
+            latencies.append(elapsed)
+
+    await asyncio.gather(*(one(False) for _ in range(warmup)))
+    started = time.perf_counter()
+    await asyncio.gather(*(one(True) for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    # 404 у случайных id - нормальный ответ, ошибкой считаются 5xx и сетевые сбои
+    errors = sum(n for code, n in codes.items() if not isinstance(code, int) or code >= 500)
+    return {
+        'requests': requests,
+        'errors': errors,
+        'codes': {str(code): n for code, n in sorted(codes.items(), key=str)},
+        'rps': round(requests / elapsed, 1),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def run(args, size: dict) -> dict:
+    import httpx
+    from config.database import async_engine
+
+    admin, users = tokens(size['users'])
+    selected = {name: value for name, value in endpoints(size).items()
+                if not args.endpoints or name in args.endpoints}
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60,
+                                   limits=httpx.Limits(max_connections=args.concurrency))
+    else:
+        from main import app
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=60)
+    results = {}
+    try:
+        async with client:
+            for name, (path_for, as_admin) in selected.items():
+                token_for = (lambda rnd: admin) if as_admin else (lambda rnd: rnd.choice(users))
+                results[name] = await measure(client, path_for, token_for, args.requests,
+                                              args.concurrency, args.warmup, args.seed)
+    finally:
+        if async_engine is not None:
+            await async_engine.dispose()
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get('endpoints', {}).get(name)
+        if not before or not before['p95_ms']:
+            continue
+        ratio = result['p95_ms'] / before['p95_ms']
+        if ratio > 1 + tolerance:
+            regressions.append({'endpoint': name, 'p95_ms': result['p95_ms'],
+                                'baseline_p95_ms': before['p95_ms'], 'ratio': round(ratio, 2)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help='dataset size relative to 100k books / 1M orders')
+    parser.add_argument('--skip-seed', action='store_true', help='reuse the database from DATABASE_URL')
+    parser.add_argument('--requests', type=int, default=1000, help='measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=50, help='unmeasured requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--endpoints', nargs='+', help='subset of endpoints to run')
+    parser.add_argument('--url', help='base URL of a running server instead of the in-process app')
+    parser.add_argument('--sync', action='store_true', help='use the sync Session in the threadpool')
+    parser.add_argument('--seed', type=int, default=42, help='random seed for request ids')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare p95 against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed p95 slowdown vs baseline')
+    args = parser.parse_args()
+    if args.skip_seed and 'DATABASE_URL' not in os.environ:
+        parser.error('--skip-seed needs DATABASE_URL pointing to a seeded database')
+
+    configure_env(db_async=not args.sync)
+    from config.database import engine
+    size = dataset_size(args.scale)
+    seed_seconds = None
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(size)
+        seed_seconds = round(time.perf_counter() - started, 1)
+
+    results = asyncio.run(run(args, size))
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'dialect': engine.dialect.name,
+            'db_async': not args.sync,
+            'target': args.url or 'in-process',
+            'dataset': size,
+            'seed_seconds': seed_seconds,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'concurrency': args.concurrency,
+        },
+        'endpoints': results,
+    }
+    failed = any(result['errors'] for result in results.values())
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(results, json.load(f), args.tolerance)
+        failed = failed or bool(report['regressions'])
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
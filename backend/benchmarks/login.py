@@ -0,0 +1,113 @@
+"""
+Пропускная способность POST /api/auth/login при одновременных входах.
+
+    python -m benchmarks.login --users 200 --requests 400 --concurrency 50
+
+Режимы:
+  inline   - pbkdf2 считается прямо в event loop (поведение до переноса в пул потоков)
+  executor - pbkdf2 в ограниченном пуле потоков utils.passwords (PASSWORD_HASH_WORKERS)
+
+Кроме скорости входов измеряется задержка event loop: в режиме inline
+остальные запросы воркера стоят, пока считается хеш.
+"""
+import argparse
+import asyncio
+import json
+import time
+from benchmarks.common import configure_env, percentile, LoopLagMonitor
+
+MODES = ('inline', 'executor')
+PASSWORD = 'password1'
+
+
+def seed(users: int):
+    from config.database import Base, engine, SessionLocal
+    from models import User
+    from utils.passwords import password_context
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # Хеш один на всех: пароль у пользователей одинаковый, а хешировать каждый долго
+    password_hash = password_context.hash(PASSWORD)
+    with SessionLocal() as db:
+        db.add_all([User(id=i, name=f'User {i}', email=f'user{i}@school.com', password=password_hash)
+                    for i in range(1, users + 1)])
+        db.commit()
+
+
+async def measure(mode: str, users: int, requests: int, concurrency: int) -> dict:
+    import httpx
+    import utils.passwords as passwords
+    from main import app
+
+    original = passwords.run_in_password_executor
+    if mode == 'inline':
+        async def run_inline(fn, *args):
+            return fn(*args)
+        passwords.run_in_password_executor = run_inline
+
+    monitor = LoopLagMonitor()
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            async def one(i: int):
+                data = {'email': f'user{i % users + 1}@school.com', 'password': PASSWORD}
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.post('/api/auth/login', data=data)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+
+            monitor.start()
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(requests)))
+            elapsed = time.perf_counter() - started
+            await monitor.stop()
+    finally:
+        passwords.run_in_password_executor = original
+
+    latencies.sort()
+    return {
+        'mode': mode,
+        'requests': requests,
+        'concurrency': concurrency,
+        'logins_per_sec': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        **monitor.result(),
+    }
+
+
+async def measure_all(modes, users: int, requests: int, concurrency: int) -> list:
+    from config.database import async_engine
+    try:
+        return [await measure(mode, users, requests, concurrency) for mode in modes]
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    configure_env()
+    seed(args.users)
+    results = asyncio.run(measure_all(args.modes, args.users, args.requests, args.concurrency))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<10}{'logins/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'lag max ms':>12}{'lag mean ms':>13}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['logins_per_sec']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['loop_lag_max_ms']:>12}{r['loop_lag_mean_ms']:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Время сериализации списков ORM-объектов в JSON: прежний путь против TypeAdapter.
+
+    python -m benchmarks.serialization --books 10000 --repeat 5
+
+  dict       - Schema(**obj.__dict__) для каждой строки (вложенные - так же), затем
+               jsonable_encoder и json.dumps, как FastAPI делает с возвращённым списком
+  adapter    - TypeAdapter(List[Schema]): validate_python(from_attributes=True) + dump_json
+               за один вызов, ответ сразу в байтах
+
+Объекты загружаются из временной SQLite-базы заранее, измеряется только сериализация.
+Результат - миллисекунды на --books строк (минимум из --repeat прогонов).
+"""
+import argparse
+import json
+import time
+from datetime import date
+from benchmarks.common import configure_env
+
+
+def seed(books: int):
+    from sqlalchemy import insert
+    from config.database import Base, engine, SessionLocal
+    from models import Author, AuthorBook, Book, Genre, GenreBook, Publisher
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.execute(insert(Publisher), [{'id': i, 'name': f'Publisher {i}', 'description': 'Publisher description',
+                                        'foundation_year': 1900} for i in range(1, 101)])
+        db.execute(insert(Author), [{'id': i, 'name': f'Author {i}', 'birth_date': date(1900, 1, 1),
+                                     'bio': 'Author biography'} for i in range(1, books // 2 + 2)])
+        db.execute(insert(Genre), [{'id': i, 'name': f'Genre {i}'} for i in range(1, 51)])
+        db.execute(insert(Book), [{'id': i, 'name': f'Book {i}', 'description': 'Book description ' * 10,
+                                   'id_publisher': i % 100 + 1, 'year': 2000, 'ISBN': f'978-{i:09}', 'count': 3}
+                                  for i in range(1, books + 1)])
+        db.execute(insert(AuthorBook), [{'id_author': i // 2 + 1, 'id_book': i} for i in range(1, books + 1)])
+        db.execute(insert(GenreBook), [{'id_genre': i % 50 + 1, 'id_book': i} for i in range(1, books + 1)])
+        db.commit()
+
+
+def dict_books(books) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    from schemas.authors import Author
+    from schemas.books import Book, Genre
+    from schemas.publishers import Publisher
+    content = [Book(**{
+        **book.__dict__,
+        'authors': [Author(**author.__dict__) for author in book.authors],
+        'genres': [Genre(**genre.__dict__) for genre in book.genres],
+        'publisher': Publisher(**book.publisher.__dict__),
+    }) for book in books]
+    return json.dumps(jsonable_encoder(content)).encode()
+
+
+def dict_flat(schema, objects) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    return json.dumps(jsonable_encoder([schema(**obj.__dict__) for obj in objects])).encode()
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    configure_env(db_async=False)
+    seed(args.books)
+    from config.database import SessionLocal
+    from crud import BookRepository
+    from models import Author, Book
+    from schemas.authors import Author as AuthorSchema, AuthorList
+    from schemas.books import Book as BookSchema
+    from pydantic import TypeAdapter
+    from typing import List
+    from utils.serialization import dump_json
+
+    book_list = TypeAdapter(List[BookSchema])
+    with SessionLocal() as db:
+        books = BookRepository(Book, db).catalog_query().all()
+        authors = db.query(Author).all()
+        # Оба пути должны давать одинаковый JSON
+        assert json.loads(dict_books(books)) == json.loads(dump_json(book_list, books))
+        cases = {
+            'books (nested)': (len(books), lambda: dict_books(books), lambda: dump_json(book_list, books)),
+            'authors (flat)': (len(authors), lambda: dict_flat(AuthorSchema, authors), lambda: dump_json(AuthorList, authors)),
+        }
+        results = []
+        for name, (rows, before, after) in cases.items():
+            dict_time, adapter_time = best_of(args.repeat, before), best_of(args.repeat, after)
+            results.append({
+                'case': name,
+                'rows': rows,
+                'dict_ms': round(dict_time * 1000, 1),
+                'adapter_ms': round(adapter_time * 1000, 1),
+                'speedup': round(dict_time / adapter_time, 1),
+            })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
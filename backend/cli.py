@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import json
+from config.database import SessionLocal
+from crud import BookRepository, BookCardRepository
+from models import Book, BookCard, Genre, GenreBook, AuthorBook
+from service import BookService
+from utils.abstract_repository import AsyncIREpository
+from utils.enums import ImportFormat
+from utils.importer import detect_format
+
+
+def book_service(session) -> BookService:
+    return BookService(book_repository=AsyncIREpository(model=Book, session=session, repository_class=BookRepository),
+                       book_genre_repository=AsyncIREpository(model=Genre, session=session, repository_class=BookRepository),
+                       book_genre_assoc_repository=AsyncIREpository(model=GenreBook, session=session, repository_class=BookRepository),
+                       book_author_assoc_repository=AsyncIREpository(model=AuthorBook, session=session, repository_class=BookRepository),
+                       book_card_repository=AsyncIREpository(model=BookCard, session=session, repository_class=BookCardRepository))
+
+
+def import_books(args):
+    import_format = ImportFormat(args.format) if args.format else detect_format(args.path)
+    session = SessionLocal()
+    try:
+        with open(args.path, 'rb') as f:
+            report = asyncio.run(book_service(session).import_books(f, import_format))
+    finally:
+        session.close()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+def rebuild_book_cards(args):
+    session = SessionLocal()
+    try:
+        rebuilt = BookCardRepository(BookCard, session).rebuild(args.batch_size)
+    finally:
+        session.close()
+    print(f'Rebuilt {rebuilt} book cards')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='School Library management commands')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_import = commands.add_parser('import-books', help='Import books from CSV or NDJSON')
+    parser_import.add_argument('path')
+    parser_import.add_argument('--format', choices=[item.value for item in ImportFormat])
+    parser_import.set_defaults(handler=import_books)
+
+    parser_cards = commands.add_parser('rebuild-book-cards', help='Rebuild the catalog book cards')
+    parser_cards.add_argument('--batch-size', type=int, default=500)
+    parser_cards.set_defaults(handler=rebuild_book_cards)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
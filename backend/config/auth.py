@@ -9,3 +9,9 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 EXPIRATION_TIME = timedelta(hours=2)
 UPDATE_EXPIRATION_TIME = timedelta(days=60)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# Кэш пользователей, найденных по токену
+AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', 4096))
+AUTH_CACHE_TTL = float(os.getenv('AUTH_CACHE_TTL', 60))
+# pbkdf2: число раундов и количество потоков для хеширования паролей
+PASSWORD_HASH_ROUNDS = int(os.getenv('PASSWORD_HASH_ROUNDS', 29000))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
@@ -0,0 +1,12 @@
+from dotenv import load_dotenv
+import os
+load_dotenv()
+# Кэш ответов справочников (жанры, издательства, авторы, классы). Сброс по счётчику версий
+# работает только внутри процесса, изменившего данные: при нескольких воркерах остальные
+# отдают прежний список до RESPONSE_CACHE_TTL секунд. Это и есть верхняя граница устаревания -
+# уменьшайте TTL, если она велика для вашей установки
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 300))
+# Кэш аналитики: ключ - окно дат, TTL ограничивает отставание от свежих заказов
+ANALYTICS_CACHE_SIZE = int(os.getenv('ANALYTICS_CACHE_SIZE', 64))
+ANALYTICS_CACHE_TTL = float(os.getenv('ANALYTICS_CACHE_TTL', 300))
@@ -0,0 +1,10 @@
+from dotenv import load_dotenv
+import os
+load_dotenv()
+# Сжатие ответов (br, gzip) по Accept-Encoding. Ответы меньше порога отдаются как есть:
+# выигрыш в байтах не окупает заголовки и время на сжатие
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+# Уровни сжатия: gzip 1-9, brotli 0-11. Высокие уровни brotli слишком медленные для живых ответов
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
+from utils.pool_stats import TimedQueuePool, TimedAsyncAdaptedQueuePool, instrument_pool
+from utils.sql_profiler import instrument_engine
 import os 
 
 load_dotenv()
@@ -12,13 +15,59 @@ PASSWORD_DB = os.getenv('PASSWORD_DB')
 HOST_DB = os.getenv('HOST_DB')
 NAME_DB = os.getenv('NAME_DB')
 
-engine = create_engine(f'mysql+pymysql://{USERNAME_DB}:{PASSWORD_DB}@{HOST_DB}/{NAME_DB}')
+# DATABASE_URL/ASYNC_DATABASE_URL позволяют подключить другую БД (например, sqlite+aiosqlite для тестов)
+DATABASE_URL = os.getenv('DATABASE_URL', f'mysql+pymysql://{USERNAME_DB}:{PASSWORD_DB}@{HOST_DB}/{NAME_DB}')
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL', f'mysql+aiomysql://{USERNAME_DB}:{PASSWORD_DB}@{HOST_DB}/{NAME_DB}')
+# true - репозитории работают через асинхронный драйвер, иначе через синхронный в пуле потоков
+DB_ASYNC = os.getenv('DB_ASYNC', 'false').lower() in ('1', 'true', 'yes')
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Настройки пула соединений
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+POOL_OPTIONS = {
+    'pool_size': DB_POOL_SIZE,
+    'max_overflow': DB_MAX_OVERFLOW,
+    'pool_timeout': DB_POOL_TIMEOUT,
+    'pool_recycle': DB_POOL_RECYCLE,
+    'pool_pre_ping': DB_POOL_PRE_PING,
+}
+
+# Массовый импорт: число строк в одной транзакции
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 500))
+# Экспорт: сколько строк читается с серверного курсора за раз
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **POOL_OPTIONS)
+instrument_pool(engine.pool)
+instrument_engine(engine)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 def get_session():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async_engine = None
+if DB_ASYNC:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool, **POOL_OPTIONS)
+    instrument_pool(async_engine.sync_engine.pool)
+    instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=async_engine)
+
+async def get_async_session():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+get_db = get_async_session if DB_ASYNC else get_session
+
+def get_pool_stats():
+    engines = {'sync': engine, 'async': async_engine.sync_engine if async_engine else None}
+    return {name: e.pool.stats.snapshot(e.pool) for name, e in engines.items() if e is not None}
\ No newline at end of file
@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+import os
+load_dotenv()
+# Кэш заголовков: имена вида <sha256>.ext не меняются, остальные перепроверяются через max-age
+IMAGE_MAX_AGE = int(os.getenv('IMAGE_MAX_AGE', 3600))
+IMMUTABLE_MAX_AGE = 31536000
+# In-memory LRU популярных картинок
+IMAGE_CACHE_SIZE = int(os.getenv('IMAGE_CACHE_SIZE', 256))
+IMAGE_CACHE_TTL = float(os.getenv('IMAGE_CACHE_TTL', 3600))
+IMAGE_CACHE_MAX_ITEM_BYTES = int(os.getenv('IMAGE_CACHE_MAX_ITEM_BYTES', 256 * 1024))
+# Сколько секунд запись кэша отдаётся без проверки файла на диске (os.stat)
+IMAGE_REVALIDATE_INTERVAL = float(os.getenv('IMAGE_REVALIDATE_INTERVAL', 5))
+# Загрузка: максимальный размер файла и размер блока записи
+IMAGE_MAX_UPLOAD_BYTES = int(os.getenv('IMAGE_MAX_UPLOAD_BYTES', 10 * 1024 * 1024))
+IMAGE_UPLOAD_CHUNK_SIZE = int(os.getenv('IMAGE_UPLOAD_CHUNK_SIZE', 64 * 1024))
@@ -0,0 +1,12 @@
+from dotenv import load_dotenv
+import os
+load_dotenv()
+# Сканер просроченных выдач: запускается в lifespan приложения и повторяется каждые
+# OVERDUE_SCAN_INTERVAL секунд; заказы обрабатываются пачками по OVERDUE_SCAN_BATCH_SIZE
+# При нескольких воркерах сканер запускается в каждом, но проход выполняет только процесс,
+# взявший блокировку GET_LOCK('overdue_scan') в MySQL; OVERDUE_SCAN_ENABLED=false в остальных
+# процессах убирает и саму фоновую задачу
+OVERDUE_SCAN_ENABLED = os.getenv('OVERDUE_SCAN_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+OVERDUE_SCAN_INTERVAL = float(os.getenv('OVERDUE_SCAN_INTERVAL', 3600))
+OVERDUE_SCAN_DELAY = float(os.getenv('OVERDUE_SCAN_DELAY', 10))
+OVERDUE_SCAN_BATCH_SIZE = int(os.getenv('OVERDUE_SCAN_BATCH_SIZE', 500))
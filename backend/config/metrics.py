@@ -0,0 +1,12 @@
+from dotenv import load_dotenv
+import os
+load_dotenv()
+# Метрики Prometheus на /metrics. При нескольких воркерах uvicorn/gunicorn задайте
+# PROMETHEUS_MULTIPROC_DIR - пустой каталог, очищаемый перед запуском: каждый процесс пишет
+# туда свои значения, а /metrics складывает их по всем процессам
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Если задан, /metrics требует заголовок Authorization: Bearer <METRICS_TOKEN>
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+# Как часто обновляются показатели пула, кэшей и задержки event loop (секунды)
+METRICS_COLLECT_INTERVAL = float(os.getenv('METRICS_COLLECT_INTERVAL', 5))
+METRICS_LAG_INTERVAL = float(os.getenv('METRICS_LAG_INTERVAL', 0.5))
@@ -0,0 +1,9 @@
+from dotenv import load_dotenv
+import os
+load_dotenv()
+# Профилирование SQL по запросам: число запросов и время в БД в заголовке Server-Timing,
+# медленные запросы и подозрения на N+1 пишутся в лог
+SQL_PROFILE_ENABLED = os.getenv('SQL_PROFILE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SQL_PROFILE_SLOW_MS = float(os.getenv('SQL_PROFILE_SLOW_MS', 500))
+# Во сколько повторов одного и того же запроса за HTTP-запрос это считается N+1
+SQL_PROFILE_N_PLUS_ONE = int(os.getenv('SQL_PROFILE_N_PLUS_ONE', 5))
@@ -1,6 +1,9 @@
 from .users import UserRepository
-from .books import BookRepository
+from .books import BookRepository, BookCardRepository
 from .authors import AuthorRepository
 from .publishers import PublisherRepository
 from .orders import OrderRepository
+from .exports import ExportRepository
+from .analytics import AnalyticsRepository
+from .overdue import OverdueRepository
 
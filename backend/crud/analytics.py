@@ -0,0 +1,61 @@
+from datetime import date
+from sqlalchemy import and_, case, extract, func, or_, select, Select
+from utils.abstract_repository import IREpository
+from models.orders import Order
+from models.books import Book, Genre, GenreBook
+from models.users import User, SchoolClass
+
+
+class AnalyticsRepository(IREpository):
+    # Все показатели считаются в БД через GROUP BY, в Python приходят только агрегаты
+    def metrics(self, today: date) -> list:
+        loaned = Order.checkout_date.isnot(None)
+        returned = Order.return_date.isnot(None)
+        overdue = or_(
+            and_(returned, Order.return_date > Order.due_date),
+            and_(loaned, Order.return_date.is_(None), Order.due_date < today),
+        )
+        return [
+            func.count(Order.id).label('orders'),
+            func.sum(case((loaned, 1), else_=0)).label('loans'),
+            func.sum(case((returned, 1), else_=0)).label('returns'),
+            func.sum(case((overdue, 1), else_=0)).label('overdue'),
+        ]
+
+    def window(self, query: Select, date_from: date = None, date_to: date = None) -> Select:
+        if date_from:
+            query = query.where(Order.order_date >= date_from)
+        if date_to:
+            query = query.where(Order.order_date <= date_to)
+        return query
+
+    def fetch(self, query: Select) -> list[dict]:
+        return [dict(row) for row in self.session.execute(query).mappings()]
+
+    def by_school_class(self, today: date, date_from: date = None, date_to: date = None) -> list[dict]:
+        query = select(SchoolClass.id.label('id_school_class'), SchoolClass.name.label('school_class'), *self.metrics(today)) \
+            .select_from(Order).join(User, User.id == Order.id_user) \
+            .outerjoin(SchoolClass, SchoolClass.id == User.id_school_class) \
+            .group_by(SchoolClass.id, SchoolClass.name).order_by(SchoolClass.name)
+        return self.fetch(self.window(query, date_from, date_to))
+
+    def by_genre(self, today: date, date_from: date = None, date_to: date = None) -> list[dict]:
+        query = select(Genre.id.label('id_genre'), Genre.name.label('genre'), *self.metrics(today)) \
+            .select_from(Order).join(GenreBook, GenreBook.id_book == Order.id_book) \
+            .join(Genre, Genre.id == GenreBook.id_genre) \
+            .group_by(Genre.id, Genre.name).order_by(Genre.name)
+        return self.fetch(self.window(query, date_from, date_to))
+
+    def by_month(self, today: date, date_from: date = None, date_to: date = None) -> list[dict]:
+        year = extract('year', Order.order_date).label('year')
+        month = extract('month', Order.order_date).label('month')
+        query = select(year, month, *self.metrics(today)).group_by(year, month).order_by(year, month)
+        return self.fetch(self.window(query, date_from, date_to))
+
+    def top_books(self, limit: int, date_from: date = None, date_to: date = None) -> list[dict]:
+        loans = func.count(Order.id).label('loans')
+        query = select(Book.id.label('id_book'), Book.name.label('book'), loans) \
+            .select_from(Order).join(Book, Book.id == Order.id_book) \
+            .where(Order.checkout_date.isnot(None)) \
+            .group_by(Book.id, Book.name).order_by(loans.desc(), Book.id).limit(limit)
+        return self.fetch(self.window(query, date_from, date_to))
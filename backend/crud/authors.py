@@ -1,4 +1,18 @@
 from utils.abstract_repository import IREpository
+from utils.pagination import Pagination
+from models.authors import Author, AuthorBook
+from utils.enums import ListView
 
 class AuthorRepository(IREpository):
-    ...
\ No newline at end of file
+    def get_all_authors_filter_by(self, pagination: Pagination = None, id_book: int = None,
+                                  view: ListView = ListView.FULL, **filter):
+        query = self.session.query(Author)
+        if view == ListView.SUMMARY:
+            query = self.load_columns(query, [Author.id, Author.name, Author.image], pagination)
+        if id_book:
+            query = query.join(AuthorBook).filter(AuthorBook.id_book == id_book)
+        for attr, value in filter.items():
+            query = query.filter(getattr(Author, attr) == value)
+        if pagination:
+            return self.paginate(query, pagination)
+        return query.all()
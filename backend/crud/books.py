@@ -1,4 +1,186 @@
 from utils.abstract_repository import IREpository
+from utils.pagination import Pagination
+from models.books import Book, BookCard, Genre, GenreBook
+from models.authors import Author, AuthorBook
+from models.publishers import Publisher
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import joinedload, selectinload
+from schemas.books import Book as BookSchema
 
 class BookRepository(IREpository):
-    ...
\ No newline at end of file
+    def filter_books_query(self, query, id_author: int = None, id_genre: int = None, **filter):
+        query = query.filter_by(**filter)
+        if id_author:
+            query = query.join(AuthorBook, AuthorBook.id_book == Book.id).filter(AuthorBook.id_author == id_author)
+        if id_genre:
+            query = query.join(GenreBook, GenreBook.id_book == Book.id).filter(GenreBook.id_genre == id_genre)
+        return query
+
+    def get_all_books_filter_by(self, id_author: int = None, id_genre: int = None, **filter):
+        return self.filter_books_query(self.session.query(Book), id_author, id_genre, **filter).all()
+
+    # Книги вместе с издательством, авторами и жанрами за постоянное число запросов
+    def catalog_query(self):
+        return self.session.query(Book).options(
+            joinedload(Book.publisher),
+            selectinload(Book.authors),
+            selectinload(Book.genres)
+        )
+
+    # Каталог читается из готовых карточек одним запросом; недостающие карточки собираются в памяти,
+    # в таблицу их записывают только изменения книг и cli.py rebuild-book-cards
+    def get_catalog_filter_by(self, pagination: Pagination = None, id_author: int = None, id_genre: int = None, **filter) -> list[str]:
+        query = self.filter_books_query(self.session.query(Book).options(joinedload(Book.card)), id_author, id_genre, **filter)
+        books = self.paginate(query, pagination) if pagination else query.all()
+        documents = {book.id: book.card.document for book in books if book.card}
+        missing = [book.id for book in books if book.id not in documents]
+        if missing:
+            documents.update(BookCardRepository(BookCard, self.session).build_documents(missing))
+        return [documents[book.id] for book in books]
+
+    # view=summary: только колонки для сетки каталога, у авторов - имя и обложка
+    def get_catalog_summary_filter_by(self, pagination: Pagination = None, id_author: int = None, id_genre: int = None, **filter):
+        query = self.load_columns(self.session.query(Book), [Book.id, Book.name, Book.image, Book.count], pagination) \
+            .options(selectinload(Book.authors).load_only(Author.id, Author.name, Author.image))
+        query = self.filter_books_query(query, id_author, id_genre, **filter)
+        if pagination:
+            return self.paginate(query, pagination)
+        return query.all()
+
+    def get_all_genres_filter_by(self, pagination: Pagination = None, id_book: int = None, **filter):
+        query = self.session.query(Genre)
+        if id_book:
+            query = query.join(GenreBook).filter(GenreBook.id_book == id_book)
+        for attr, value in filter.items():
+            query = query.filter(getattr(Genre, attr) == value)
+        if pagination:
+            return self.paginate(query, pagination)
+        return query.all()
+
+    # Массовый импорт: пачка строк - одна транзакция, вставки через executemany
+    def resolve_names(self, model, names: set, defaults: dict, created: dict) -> dict:
+        # Сравнение без учёта регистра, как в collation БД: "Толкин" и "толкин" - один автор
+        if not names:
+            return {}
+        ids = {name.casefold(): id for name, id in
+               self.session.execute(select(model.name, model.id).where(model.name.in_(names))).all()}
+        missing = {}
+        for name in sorted(names):
+            if name.casefold() not in ids:
+                missing.setdefault(name.casefold(), name)
+        if missing:
+            self.session.execute(insert(model), [{'name': name, **defaults} for name in missing.values()])
+            ids.update({name.casefold(): id for name, id in
+                        self.session.execute(select(model.name, model.id).where(model.name.in_(missing.values()))).all()})
+            created[model.__tablename__] += len(missing)
+        return {name: ids[name.casefold()] for name in names}
+
+    def autoinc_consecutive(self) -> bool:
+        # Многострочный INSERT получает подряд идущие id только при innodb_autoinc_lock_mode <= 1;
+        # в режиме 2 (по умолчанию в MySQL 8) id параллельных вставок могут чередоваться
+        return self.session.scalar(text('SELECT @@innodb_autoinc_lock_mode')) <= 1
+
+    def insert_books(self, books: list[dict]) -> list[int]:
+        dialect = self.session.get_bind().dialect
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            return list(self.session.scalars(insert(Book).returning(Book.id, sort_by_parameter_order=True), books))
+        # MySQL не поддерживает RETURNING. Один INSERT ... VALUES (...), (...) возвращает в lastrowid
+        # id первой строки, остальные идут подряд, если это гарантирует режим автоинкремента;
+        # иначе строки вставляются по одной со своим lastrowid
+        if dialect.name == 'mysql' and self.autoinc_consecutive():
+            first_id = self.session.execute(insert(Book).values(books)).lastrowid
+            return list(range(first_id, first_id + len(books)))
+        return [self.session.execute(insert(Book).values(book)).lastrowid for book in books]
+
+    def import_books(self, rows: list[dict]) -> dict:
+        created = {'authors': 0, 'genres': 0, 'publishers': 0}
+        try:
+            publishers = self.resolve_names(Publisher, {row['publisher'] for row in rows}, {'description': ''}, created)
+            authors = self.resolve_names(Author, {name for row in rows for name in row['authors']}, {'bio': ''}, created)
+            genres = self.resolve_names(Genre, {name for row in rows for name in row['genres']}, {}, created)
+
+            books = [{
+                'name': row['name'],
+                'description': row['description'],
+                'id_publisher': publishers[row['publisher']],
+                'year': row['year'],
+                'ISBN': row['ISBN'],
+                'count': row['count'],
+            } for row in rows]
+            ids = self.insert_books(books)
+
+            author_books = [{'id_book': id, 'id_author': authors[name]} for id, row in zip(ids, rows) for name in row['authors']]
+            if author_books:
+                self.session.execute(insert(AuthorBook), author_books)
+            genre_books = [{'id_book': id, 'id_genre': genres[name]} for id, row in zip(ids, rows) for name in row['genres']]
+            if genre_books:
+                self.session.execute(insert(GenreBook), genre_books)
+            BookCardRepository(BookCard, self.session).refresh(ids)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return created
+
+
+class BookCardRepository(IREpository):
+    def build_documents(self, ids: list[int]) -> dict[int, str]:
+        # populate_existing: остаток мог измениться UPDATE-ом в обход уже загруженных объектов
+        books = BookRepository(Book, self.session).catalog_query().filter(Book.id.in_(ids)) \
+            .execution_options(populate_existing=True).all()
+        documents = {book.id: BookSchema.model_validate(book).model_dump_json() for book in books}
+        # Связи нужны только для карточки, не оставляем их на объектах, которые вернёт сервис
+        for book in books:
+            self.session.expire(book, ['publisher', 'authors', 'genres'])
+        return documents
+
+    def refresh(self, ids: list[int], batch_size: int = 500) -> dict[int, str]:
+        ids = sorted(set(ids))
+        documents = {}
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            built = self.build_documents(batch)
+            self.session.query(BookCard).filter(BookCard.id_book.in_(batch)).delete(synchronize_session=False)
+            if built:
+                self.session.execute(insert(BookCard), [{'id_book': id, 'document': document} for id, document in built.items()])
+            documents.update(built)
+        if ids:
+            self.commit()
+        return documents
+
+    # Смена остатка при выдаче и возврате: в карточке меняется только поле count одним UPDATE,
+    # без пересборки документа внутри транзакции, держащей блокировку книги
+    def update_count(self, id_book: int):
+        count = select(Book.count).where(Book.id == id_book).scalar_subquery()
+        self.session.query(BookCard).filter(BookCard.id_book == id_book) \
+            .update({BookCard.document: func.json_set(BookCard.document, '$.count', count)}, synchronize_session=False)
+
+    def get_book_ids(self, id_author: int = None, id_genre: int = None, id_publisher: int = None) -> list[int]:
+        query = self.session.query(Book.id)
+        if id_author:
+            query = query.join(AuthorBook, AuthorBook.id_book == Book.id).filter(AuthorBook.id_author == id_author)
+        if id_genre:
+            query = query.join(GenreBook, GenreBook.id_book == Book.id).filter(GenreBook.id_genre == id_genre)
+        if id_publisher:
+            query = query.filter(Book.id_publisher == id_publisher)
+        return [id for id, in query.all()]
+
+    def get_document(self, id: int) -> str | None:
+        document = self.session.query(BookCard.document).filter(BookCard.id_book == id).scalar()
+        # Чтение ничего не пишет: без карточки документ собирается в памяти, для несуществующей книги - None
+        if document is None:
+            document = self.build_documents([id]).get(id)
+        return document
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        # Полная пересборка пачками по id, каждая пачка - отдельная транзакция
+        rebuilt, last_id = 0, 0
+        while ids := [id for id, in self.session.query(Book.id).filter(Book.id > last_id)
+                      .order_by(Book.id).limit(batch_size).all()]:
+            rebuilt += len(self.refresh(ids, batch_size))
+            last_id = ids[-1]
+        self.session.query(BookCard).filter(BookCard.id_book.not_in(self.session.query(Book.id))) \
+            .delete(synchronize_session=False)
+        self.commit()
+        return rebuilt
+
@@ -0,0 +1,41 @@
+from datetime import date
+from sqlalchemy import select, Select
+from utils.abstract_repository import IREpository
+from models.orders import Order
+from models.books import Book
+from models.publishers import Publisher
+from models.users import User, SchoolClass
+
+
+class ExportRepository(IREpository):
+    # Выгрузки выбирают только нужные колонки, без ORM-объектов
+    def orders_query(self, date_from: date = None, date_to: date = None, status: str = None) -> Select:
+        query = select(
+            Order.id, Order.id_user, User.name.label('user_name'), User.email.label('user_email'),
+            Order.id_book, Book.name.label('book_name'), Order.order_date, Order.checkout_date,
+            Order.due_date, Order.return_date, Order.status,
+        ).join(User, User.id == Order.id_user).join(Book, Book.id == Order.id_book)
+        if date_from:
+            query = query.where(Order.order_date >= date_from)
+        if date_to:
+            query = query.where(Order.order_date <= date_to)
+        if status:
+            query = query.where(Order.status == status)
+        return query.order_by(Order.id)
+
+    def books_query(self) -> Select:
+        return select(
+            Book.id, Book.name, Book.ISBN, Book.year, Book.count, Book.id_publisher,
+            Publisher.name.label('publisher_name'),
+        ).join(Publisher, Publisher.id == Book.id_publisher).order_by(Book.id)
+
+    def users_query(self) -> Select:
+        return select(
+            User.id, User.name, User.email, User.role, User.id_school_class,
+            SchoolClass.name.label('school_class_name'),
+        ).outerjoin(SchoolClass, SchoolClass.id == User.id_school_class).order_by(User.id)
+
+    def stream(self, query: Select, batch_size: int):
+        # yield_per включает серверный курсор (stream_results): в памяти только одна пачка
+        result = self.session.execute(query.execution_options(yield_per=batch_size))
+        yield from result.partitions()
@@ -1,4 +1,68 @@
 from utils.abstract_repository import IREpository
+from utils.pagination import Pagination
+from models.orders import Order, OverdueOrder
+from models.books import Book, BookCard
+from models.users import User
+from crud.books import BookCardRepository
+from utils.enums import OrderStatus, OrderTransition, ListView
+from sqlalchemy.orm import joinedload
 
 class OrderRepository(IREpository):
-    ...
\ No newline at end of file
+    # Заказы вместе с пользователем и книгой одним запросом
+    def details_query(self):
+        return self.session.query(Order).options(
+            joinedload(Order.user).joinedload(User.school_class),
+            joinedload(Order.book)
+        )
+
+    # view=summary: у пользователя и книги читаются только имя и название, без описаний
+    def summary_query(self, pagination: Pagination = None):
+        query = self.load_columns(self.session.query(Order), [
+            Order.id, Order.order_date, Order.due_date, Order.return_date, Order.status
+        ], pagination)
+        return query.options(
+            joinedload(Order.user).load_only(User.id, User.name),
+            joinedload(Order.book).load_only(Book.id, Book.name, Book.image)
+        )
+
+    def get_all_orders_details_filter_by(self, pagination: Pagination = None, view: ListView = ListView.FULL, **filter):
+        query = self.summary_query(pagination) if view == ListView.SUMMARY else self.details_query()
+        query = query.filter_by(**filter)
+        if pagination:
+            return self.paginate(query, pagination)
+        return query.all()
+
+    def get_one_order_details(self, id: int):
+        return self.details_query().filter(Order.id == id).first()
+
+    # Смена статуса заказа и остатка книги без чтения-изменения-записи в Python:
+    # статус меняется только если его не успел изменить другой запрос, а остаток
+    # уменьшается условием count >= 1 в самом UPDATE
+    def change_status(self, id: int, entity: dict, stock_delta) -> OrderTransition:
+        # FOR UPDATE: на MySQL одновременные переходы одного заказа выполняются по очереди
+        order = self.session.query(Order.status, Order.id_book).filter(Order.id == id).with_for_update().first()
+        if order is None:
+            return OrderTransition.NOT_FOUND
+        # Повторный переход в тот же статус сдвинул бы даты выдачи и возврата
+        if order.status == entity['status']:
+            return OrderTransition.SAME_STATUS
+        delta = stock_delta(order.status, entity['status'])
+
+        updated = self.session.query(Order).filter(Order.id == id, Order.status == order.status) \
+            .update(entity, synchronize_session=False)
+        if not updated:
+            return OrderTransition.STATUS_CHANGED
+        # Выдача закрыта - убираем её из списка просрочек, не дожидаясь сканера
+        if order.status == OrderStatus.CHECKED_OUT.value:
+            self.session.query(OverdueOrder).filter(OverdueOrder.id == id).delete(synchronize_session=False)
+
+        if delta:
+            query = self.session.query(Book).filter(Book.id == order.id_book)
+            if delta < 0:
+                query = query.filter(Book.count >= -delta)
+            if not query.update({Book.count: Book.count + delta}, synchronize_session=False):
+                return OrderTransition.OUT_OF_STOCK
+            BookCardRepository(BookCard, self.session).update_count(order.id_book)
+        self.commit()
+        return OrderTransition.APPLIED
+
@@ -0,0 +1,74 @@
+from datetime import date, datetime
+from sqlalchemy import and_, delete, or_, select, text
+from sqlalchemy.dialects import mysql, sqlite
+from utils.abstract_repository import IREpository
+from models.orders import Order, OverdueOrder
+from utils.enums import OrderStatus
+
+
+SCAN_LOCK = 'overdue_scan'
+UPSERT_COLUMNS = ('id_user', 'id_book', 'due_date', 'days_overdue', 'scanned_at')
+
+
+# Сканер может быть запущен в каждом воркере: проход выполняет только тот процесс, который
+# взял именованную блокировку MySQL. Блокировка принадлежит соединению, поэтому весь проход
+# идёт через него. На SQLite (разработка, один процесс) блокировка не нужна
+def acquire_scan_lock(connection) -> bool:
+    if connection.dialect.name != 'mysql':
+        return True
+    acquired = connection.scalar(text('SELECT GET_LOCK(:name, 0)'), {'name': SCAN_LOCK}) == 1
+    connection.commit()
+    return acquired
+
+
+def release_scan_lock(connection):
+    if connection.dialect.name == 'mysql':
+        connection.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': SCAN_LOCK})
+        connection.commit()
+
+
+class OverdueRepository(IREpository):
+    # Пачка просроченных выдач после (due_date, id) последней строки прошлой пачки.
+    # Диапазонный запрос по индексу ix_orders_status_due_date, без полного просмотра orders
+    def get_overdue_batch(self, today: date, batch_size: int, after: tuple[date, int] | None = None) -> list:
+        query = select(Order.id, Order.id_user, Order.id_book, Order.due_date) \
+            .where(Order.status == OrderStatus.CHECKED_OUT.value, Order.due_date < today)
+        if after:
+            due_date, id = after
+            query = query.where(or_(Order.due_date > due_date, and_(Order.due_date == due_date, Order.id > id)))
+        query = query.order_by(Order.due_date, Order.id).limit(batch_size)
+        return self.session.execute(query).all()
+
+    def upsert_statement(self):
+        if self.session.get_bind().dialect.name == 'mysql':
+            statement = mysql.insert(OverdueOrder)
+            return statement.on_duplicate_key_update({column: statement.inserted[column] for column in UPSERT_COLUMNS})
+        statement = sqlite.insert(OverdueOrder)
+        return statement.on_conflict_do_update(index_elements=[OverdueOrder.id],
+                                               set_={column: statement.excluded[column] for column in UPSERT_COLUMNS})
+
+    def save_batch(self, rows: list, today: date, scanned_at: datetime):
+        self.session.execute(self.upsert_statement(), [{
+            'id': row.id,
+            'id_user': row.id_user,
+            'id_book': row.id_book,
+            'due_date': row.due_date,
+            'days_overdue': (today - row.due_date).days,
+            'scanned_at': scanned_at,
+        } for row in rows])
+        self.commit()
+
+    # Строки, не встретившиеся в текущем проходе, больше не просрочены
+    def delete_stale(self, scanned_at: datetime) -> int:
+        deleted = self.session.execute(delete(OverdueOrder).where(OverdueOrder.scanned_at < scanned_at)).rowcount
+        self.commit()
+        return deleted
+
+    def scan(self, today: date, scanned_at: datetime, batch_size: int) -> int:
+        found, after = 0, None
+        while rows := self.get_overdue_batch(today, batch_size, after):
+            self.save_batch(rows, today, scanned_at)
+            found += len(rows)
+            after = (rows[-1].due_date, rows[-1].id)
+        self.delete_stale(scanned_at)
+        return found
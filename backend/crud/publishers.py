@@ -1,4 +1,13 @@
 from utils.abstract_repository import IREpository
+from utils.pagination import Pagination
+from utils.enums import ListView
+from models.publishers import Publisher
 
 class PublisherRepository(IREpository):
-    ...
\ No newline at end of file
+    def get_all_publishers_filter_by(self, pagination: Pagination = None, view: ListView = ListView.FULL, **filter):
+        query = self.session.query(Publisher).filter_by(**filter)
+        if view == ListView.SUMMARY:
+            query = self.load_columns(query, [Publisher.id, Publisher.name, Publisher.image], pagination)
+        if pagination:
+            return self.paginate(query, pagination)
+        return query.all()
@@ -1,4 +1,15 @@
 from utils.abstract_repository import IREpository
+from models.users import User
+from utils.pagination import Pagination
+from sqlalchemy.orm import joinedload
 
 class UserRepository(IREpository):
-    ...
\ No newline at end of file
+    # Пользователь вместе с классом: UserResponse читает school_class сразу
+    def get_one_user_details(self, **filter):
+        return self.session.query(User).options(joinedload(User.school_class)).filter_by(**filter).first()
+
+    def get_all_users_details(self, pagination: Pagination = None, **filter):
+        query = self.session.query(User).options(joinedload(User.school_class)).filter_by(**filter)
+        if pagination:
+            return self.paginate(query, pagination)
+        return query.all()
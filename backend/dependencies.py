@@ -1,85 +1,142 @@
-from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, Query
 from models import *
 from crud import *
-from config.database import get_session
+from config.database import get_db, engine, SessionLocal
 from config.auth import oauth2_scheme
+from utils.abstract_repository import AsyncIREpository
 from utils.enums import Roles, AuthStatus
+from utils.pagination import Pagination, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, invalid_pagination
 from service import *
 
+# Pagination
+def pagination_params(*sortable: str):
+    # Сортировать можно только по индексированным колонкам из списка эндпоинта: иначе каждая
+    # страница - сортировка всей таблицы, а в курсор попадает значение произвольной длины
+    allowed = ('id', *sortable)
+
+    def get_pagination(limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                       cursor: str | None = Query(None),
+                       sort: str = Query('id'),
+                       all: bool = Query(False)) -> Pagination | None:
+        if sort.lstrip('-') not in allowed:
+            raise invalid_pagination(f'Cannot sort by {sort.lstrip("-")}, allowed: {", ".join(allowed)}')
+        # Без limit и cursor - первая страница по DEFAULT_PAGE_SIZE. Весь список целиком
+        # (выпадающие списки фронтенда) - только явно, через all=true
+        if all:
+            if limit is not None or cursor is not None or sort != 'id':
+                raise invalid_pagination('all cannot be combined with limit, cursor or sort')
+            return None
+        return Pagination(limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor, sort=sort)
+    return get_pagination
+
+get_pagination = pagination_params()
+
 # User and Auth
-def get_user_repository(db: Session = Depends(get_session)):
-    return UserRepository(model=User, session=db)
+def get_user_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=User, session=db, repository_class=UserRepository)
 
-def get_school_class_repository(db: Session = Depends(get_session)):
-    return UserRepository(model=SchoolClass, session=db)
+def get_school_class_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=SchoolClass, session=db, repository_class=UserRepository)
 
-def get_auth_service(user_repository: UserRepository = Depends(get_user_repository)) -> AuthService:
+def get_auth_service(user_repository: AsyncIREpository = Depends(get_user_repository)) -> AuthService:
     return AuthService(user_repository=user_repository)
 
-def get_current_user(token: str=Depends(oauth2_scheme), user_repository: UserRepository = Depends(get_user_repository)) -> User:
+async def get_current_user(token: str=Depends(oauth2_scheme), user_repository: AsyncIREpository = Depends(get_user_repository)) -> User:
     service = AuthService(user_repository=user_repository)
-    return service.get_user_by_token(token)
+    return await service.get_user_by_token(token)
 
-def get_current_admin(token: str=Depends(oauth2_scheme), user_repository: UserRepository = Depends(get_user_repository)) -> User:
+async def get_current_admin(token: str=Depends(oauth2_scheme), user_repository: AsyncIREpository = Depends(get_user_repository)) -> User:
     service = AuthService(user_repository=user_repository)
-    user = service.get_user_by_token(token)
+    user = await service.get_user_by_token(token)
     if user.role != Roles.ADMIN.value:
         raise HTTPException(status_code=403, detail={'status': AuthStatus.FORBIDDEN.value})
     return user
 
-def get_user_service(user_repository: UserRepository = Depends(get_user_repository),
-                     school_class_repository: UserRepository = Depends(get_school_class_repository)) -> UserService:
+def get_user_service(user_repository: AsyncIREpository = Depends(get_user_repository),
+                     school_class_repository: AsyncIREpository = Depends(get_school_class_repository)) -> UserService:
     return UserService(user_repository=user_repository,
                        school_class_repository=school_class_repository)
 
 
 # Associations
-def get_book_genre_assoc_repository(db: Session = Depends(get_session)):
-    return BookRepository(model=GenreBook, session=db)
+def get_book_genre_assoc_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=GenreBook, session=db, repository_class=BookRepository)
 
-def get_author_assoc_repository(db: Session = Depends(get_session)):
-    return BookRepository(model=AuthorBook, session=db)
+def get_author_assoc_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=AuthorBook, session=db, repository_class=BookRepository)
 
 
 # Book
-def get_book_repository(db: Session = Depends(get_session)):
-    return BookRepository(model=Book, session=db)
+def get_book_card_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=BookCard, session=db, repository_class=BookCardRepository)
+
+def get_book_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=Book, session=db, repository_class=BookRepository)
 
-def get_book_genre_repository(db: Session = Depends(get_session)):
-    return BookRepository(model=Genre, session=db)
+def get_book_genre_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=Genre, session=db, repository_class=BookRepository)
 
-def get_book_service(book_repository: BookRepository = Depends(get_book_repository),
-                     book_genre_repository: BookRepository = Depends(get_book_genre_repository),
-                     book_genre_assoc_repository: BookRepository = Depends(get_book_genre_assoc_repository),
-                     book_author_assoc_repository: BookRepository = Depends(get_author_assoc_repository)):
+def get_book_service(book_repository: AsyncIREpository = Depends(get_book_repository),
+                     book_genre_repository: AsyncIREpository = Depends(get_book_genre_repository),
+                     book_genre_assoc_repository: AsyncIREpository = Depends(get_book_genre_assoc_repository),
+                     book_author_assoc_repository: AsyncIREpository = Depends(get_author_assoc_repository),
+                     book_card_repository: AsyncIREpository = Depends(get_book_card_repository)):
     return BookService(book_repository=book_repository,
                        book_genre_repository=book_genre_repository,
                        book_genre_assoc_repository=book_genre_assoc_repository,
-                       book_author_assoc_repository=book_author_assoc_repository)
+                       book_author_assoc_repository=book_author_assoc_repository,
+                       book_card_repository=book_card_repository)
 
 
 # Author
-def get_author_repository(db: Session = Depends(get_session)):
-    return AuthorRepository(model=Author, session=db)
+def get_author_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=Author, session=db, repository_class=AuthorRepository)
 
-def get_author_service(author_repository: AuthorRepository = Depends(get_author_repository),
-                       book_author_assoc_repository: BookRepository = Depends(get_author_assoc_repository)):
+def get_author_service(author_repository: AsyncIREpository = Depends(get_author_repository),
+                       book_author_assoc_repository: AsyncIREpository = Depends(get_author_assoc_repository),
+                       book_card_repository: AsyncIREpository = Depends(get_book_card_repository)):
     return AuthorService(author_repository=author_repository,
-                         book_author_assoc_repository=book_author_assoc_repository)
+                         book_author_assoc_repository=book_author_assoc_repository,
+                         book_card_repository=book_card_repository)
 
 
 # Publisher
-def get_publisher_repository(db: Session = Depends(get_session)):
-    return PublisherRepository(model=Publisher, session=db)
+def get_publisher_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=Publisher, session=db, repository_class=PublisherRepository)
 
-def get_publisher_service(publisher_repository: PublisherRepository = Depends(get_publisher_repository)):
-    return PublisherService(publisher_repository = publisher_repository)
+def get_publisher_service(publisher_repository: AsyncIREpository = Depends(get_publisher_repository),
+                          book_card_repository: AsyncIREpository = Depends(get_book_card_repository)):
+    return PublisherService(publisher_repository = publisher_repository,
+                            book_card_repository=book_card_repository)
 
 
 # Orders
-def get_order_repository(db: Session = Depends(get_session)):
-    return OrderRepository(model=Order, session=db)
+def get_order_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=Order, session=db, repository_class=OrderRepository)
+
+def get_order_service(order_repository: AsyncIREpository = Depends(get_order_repository)) -> OrderService:
+    return OrderService(order_repository=order_repository)
+
+
+# Export
+def get_export_service() -> ExportService:
+    return ExportService(session_factory=SessionLocal)
+
+
+# Analytics
+def get_analytics_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=Order, session=db, repository_class=AnalyticsRepository)
+
+def get_analytics_service(analytics_repository: AsyncIREpository = Depends(get_analytics_repository)) -> AnalyticsService:
+    return AnalyticsService(analytics_repository=analytics_repository)
+
+
+# Overdue
+overdue_scanner = OverdueScanner(engine=engine, session_factory=SessionLocal)
+
+def get_overdue_repository(db = Depends(get_db)):
+    return AsyncIREpository(model=OverdueOrder, session=db, repository_class=OverdueRepository)
+
+def get_overdue_service(overdue_repository: AsyncIREpository = Depends(get_overdue_repository)) -> OverdueService:
+    return OverdueService(overdue_repository=overdue_repository, scanner=overdue_scanner)
 
-def get_order_service(order_repository: OrderRepository = Depends(get_order_repository)) -> OrderService:
-    return OrderService(order_repository=order_repository)
\ No newline at end of file
@@ -1,20 +1,91 @@
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
+from config.compression import COMPRESSION_ENABLED
+from config.database import async_engine, engine, get_pool_stats
+from config.jobs import OVERDUE_SCAN_ENABLED
+from config.metrics import METRICS_ENABLED, METRICS_TOKEN
+from config.profiling import SQL_PROFILE_ENABLED
+from dependencies import overdue_scanner
+from prometheus_client import CONTENT_TYPE_LATEST
 from routers import routers
 from starlette.middleware.cors import CORSMiddleware
+from utils.compression import CompressionMiddleware
+from utils.enums import ImageSize, ImageFormat, Status
+from utils.image import MEDIA_TYPES, get_variant, image_path
+from utils.image_cache import image_cache, image_response
+from utils.metrics import MetricsCollector, MetricsMiddleware, mark_process_dead, render
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.response_cache import response_cache
+from utils.sql_profiler import SQLProfilerMiddleware
+from service.analytics import analytics_cache
+from service.auth import user_cache
 
-app = FastAPI(title="School Library API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if OVERDUE_SCAN_ENABLED:
+        tasks.append(asyncio.create_task(overdue_scanner.run()))
+    if METRICS_ENABLED:
+        caches = {'auth_users': user_cache, 'images': image_cache, 'responses': response_cache.cache,
+                  'analytics': analytics_cache}
+        tasks.append(asyncio.create_task(MetricsCollector(get_pool_stats, caches).run()))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # Закрываем соединения пулов: поток aiosqlite иначе не даёт процессу завершиться
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+    if METRICS_ENABLED:
+        mark_process_dead()
+
+app = FastAPI(title="School Library API", lifespan=lifespan)
 
 app.include_router(routers)
 
+if SQL_PROFILE_ENABLED:
+    app.add_middleware(SQLProfilerMiddleware)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Снаружи метрик и профилировщика: их заголовки попадают в ответ до сжатия тела
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:3001"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Объявлен до /{image_name}, иначе путь заберёт раздача картинок
+@app.get('/metrics', include_in_schema=False)
+async def metrics(request: Request):
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
+    if METRICS_TOKEN and request.headers.get('authorization') != f'Bearer {METRICS_TOKEN}':
+        raise HTTPException(status_code=401, detail={'status': Status.FAILED.value})
+    return Response(content=render(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get('/{image_name}')
-async def get_image(image_name: str):
-    return FileResponse(f'./images/{image_name}')
\ No newline at end of file
+async def get_image(image_name: str, request: Request, size: ImageSize | None = None,
+                    format: ImageFormat | None = None):
+    if size is None:
+        response = await image_response(request, image_path(image_name), image_name)
+    else:
+        # Без явного format отдаём WebP тем клиентам, которые его принимают
+        headers = {}
+        if format is None:
+            format = ImageFormat.WEBP if 'image/webp' in request.headers.get('accept', '') else ImageFormat.JPEG
+            headers['Vary'] = 'Accept'
+        path = await get_variant(image_name, size, format)
+        response = path and await image_response(request, path, image_name, MEDIA_TYPES[format], headers)
+    if response is None:
+        raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
+    return response
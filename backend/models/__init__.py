@@ -1,5 +1,5 @@
-from .orders import Order
+from .orders import Order, OverdueOrder
 from .users import User, SchoolClass
-from .books import Book, Genre, GenreBook
+from .books import Book, BookCard, Genre, GenreBook
 from .authors import Author, AuthorBook
 from .publishers import Publisher
\ No newline at end of file
@@ -1,22 +1,26 @@
 from config.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, ForeignKey, TEXT, DATE
+from sqlalchemy import Integer, String, ForeignKey, TEXT, DATE, Index
 from datetime import date
+from typing import List
 
 class Author(Base):
     __tablename__ = 'authors'
+    __table_args__ = (Index('ix_authors_name', 'name'),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255))
     image: Mapped[str] = mapped_column(String(255), default='placeholder.png')
-    birth_date: Mapped[date] = mapped_column(DATE)
+    birth_date: Mapped[date] = mapped_column(DATE, nullable=True)
     death_date: Mapped[date] = mapped_column(DATE, nullable=True)
     bio: Mapped[str] = mapped_column(TEXT)
 
-    author_book: Mapped["AuthorBook"] = relationship("AuthorBook", back_populates="author")
+    author_book: Mapped[List["AuthorBook"]] = relationship("AuthorBook", back_populates="author")
 
 class AuthorBook(Base):
     __tablename__ = 'author_books'
+    # Первичный ключ начинается с id_author, для поиска авторов книги нужен обратный индекс
+    __table_args__ = (Index('ix_author_books_id_book', 'id_book', 'id_author'),)
 
     id_author: Mapped[int] = mapped_column(ForeignKey('authors.id'), primary_key=True)
     id_book: Mapped[int] = mapped_column(ForeignKey('books.id'), primary_key=True)
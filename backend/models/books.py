@@ -1,9 +1,15 @@
 from config.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, ForeignKey, TEXT, BOOLEAN
+from sqlalchemy import Integer, String, ForeignKey, TEXT, BOOLEAN, Index
+from typing import List
 
 class Book(Base):
     __tablename__ = 'books'
+    __table_args__ = (
+        Index('ix_books_isbn', 'ISBN'),
+        Index('ix_books_id_publisher', 'id_publisher'),
+        Index('ix_books_name', 'name'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255))
@@ -14,14 +20,31 @@ class Book(Base):
     ISBN: Mapped[str] = mapped_column(String(255))
     count: Mapped[int] = mapped_column(Integer)
 
-    genre_book: Mapped["GenreBook"] = relationship("GenreBook", back_populates="book")
-    author_book: Mapped["AuthorBook"] = relationship("AuthorBook", back_populates="book")
+    genre_book: Mapped[List["GenreBook"]] = relationship("GenreBook", back_populates="book")
+    author_book: Mapped[List["AuthorBook"]] = relationship("AuthorBook", back_populates="book")
     publisher: Mapped["Publisher"] = relationship("Publisher", back_populates="book")
-    order: Mapped["Order"] = relationship("Order", back_populates="book")
+    order: Mapped[List["Order"]] = relationship("Order", back_populates="book")
+
+    # Прямые связи через таблицы-ассоциации, только для чтения каталога
+    authors: Mapped[List["Author"]] = relationship("Author", secondary="author_books", viewonly=True)
+    genres: Mapped[List["Genre"]] = relationship("Genre", secondary="genre_books", viewonly=True)
+    # Готовая карточка каталога
+    card: Mapped["BookCard"] = relationship("BookCard", viewonly=True)
+
+
+class BookCard(Base):
+    # Read model каталога: собранный JSON schemas.books.Book, обновляется при изменении книги,
+    # её авторов, жанров, издательства и остатка
+    __tablename__ = 'book_cards'
+
+    id_book: Mapped[int] = mapped_column(ForeignKey('books.id', ondelete='CASCADE'), primary_key=True)
+    document: Mapped[str] = mapped_column(TEXT)
 
 
 class GenreBook(Base):
     __tablename__ = 'genre_books'
+    # Первичный ключ начинается с id_genre, для поиска жанров книги нужен обратный индекс
+    __table_args__ = (Index('ix_genre_books_id_book', 'id_book', 'id_genre'),)
 
     id_genre: Mapped[int] = mapped_column(ForeignKey('genres.id'), primary_key=True)
     id_book: Mapped[int] = mapped_column(ForeignKey('books.id'), primary_key=True)
@@ -31,9 +54,10 @@ class GenreBook(Base):
 
 class Genre(Base):
     __tablename__ = 'genres'
+    __table_args__ = (Index('ix_genres_name', 'name'),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255))
 
-    genre_book: Mapped["GenreBook"] = relationship("GenreBook", back_populates="genre")
+    genre_book: Mapped[List["GenreBook"]] = relationship("GenreBook", back_populates="genre")
 
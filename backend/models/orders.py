@@ -1,10 +1,17 @@
 from config.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, ForeignKey, DATE, String
-from datetime import date
+from sqlalchemy import Integer, ForeignKey, DATE, DATETIME, String, Index
+from datetime import date, datetime
 
 class Order(Base):
     __tablename__ = 'orders'
+    # Поиск просроченных выдач: status = CHECKED_OUT AND due_date < сегодня
+    __table_args__ = (
+        Index('ix_orders_status_due_date', 'status', 'due_date'),
+        Index('ix_orders_id_user_status', 'id_user', 'status'),
+        Index('ix_orders_id_book_status', 'id_book', 'status'),
+        Index('ix_orders_order_date', 'order_date'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     id_user: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -16,4 +23,16 @@ class Order(Base):
     status: Mapped[str] = mapped_column(String(255)) 
 
     user: Mapped["User"] = relationship("User", back_populates="order")
-    book: Mapped["Book"] = relationship("Book", back_populates="order")
\ No newline at end of file
+    book: Mapped["Book"] = relationship("Book", back_populates="order")
+
+
+class OverdueOrder(Base):
+    # Результат последнего прохода сканера просрочек; id совпадает с id заказа
+    __tablename__ = 'overdue_orders'
+
+    id: Mapped[int] = mapped_column(ForeignKey('orders.id', ondelete='CASCADE'), primary_key=True)
+    id_user: Mapped[int] = mapped_column(Integer)
+    id_book: Mapped[int] = mapped_column(Integer)
+    due_date: Mapped[date] = mapped_column(DATE)
+    days_overdue: Mapped[int] = mapped_column(Integer)
+    scanned_at: Mapped[datetime] = mapped_column(DATETIME)
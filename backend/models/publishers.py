@@ -1,15 +1,17 @@
 from config.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, DATE, TEXT
+from sqlalchemy import Integer, String, DATE, TEXT, Index
 from datetime import date
+from typing import List
 
 class Publisher(Base):
     __tablename__ = 'publishers'
+    __table_args__ = (Index('ix_publishers_name', 'name'),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255))
     image: Mapped[str] = mapped_column(String(255), default='placeholder.png')
     description: Mapped[str] = mapped_column(TEXT)
-    foundation_year: Mapped[int] = mapped_column(Integer)
+    foundation_year: Mapped[int] = mapped_column(Integer, nullable=True)
 
-    book: Mapped["Book"] = relationship("Book", back_populates="publisher")
\ No newline at end of file
+    book: Mapped[List["Book"]] = relationship("Book", back_populates="publisher")
\ No newline at end of file
@@ -1,9 +1,11 @@
 from config.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import Integer, String, ForeignKey, Index
+from typing import List
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (Index('ux_users_email', 'email', unique=True),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255))
@@ -12,7 +14,7 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(255))
     password: Mapped[str] = mapped_column(String(255))
 
-    order: Mapped["Order"] = relationship("Order", back_populates="user")
+    order: Mapped[List["Order"]] = relationship("Order", back_populates="user")
     school_class: Mapped["SchoolClass"] = relationship("SchoolClass", back_populates="user")
 
 class SchoolClass(Base):
@@ -21,4 +23,4 @@ class SchoolClass(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255))
 
-    user: Mapped["User"] = relationship("User", back_populates="school_class")
\ No newline at end of file
+    user: Mapped[List["User"]] = relationship("User", back_populates="school_class")
\ No newline at end of file
@@ -0,0 +1,79 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from dependencies import get_current_admin, get_export_service, get_analytics_service, get_overdue_service, get_pagination
+from config.database import get_pool_stats
+from service.auth import user_cache
+from utils.image_cache import image_cache
+from utils.response_cache import response_cache
+from service.analytics import AnalyticsService, analytics_cache
+from service.exports import ExportService, MEDIA_TYPES
+from service.overdue import OverdueService
+from utils.pagination import Pagination, set_next_cursor
+from utils.enums import Status, ExportEntity, ExportFormat, OrderStatus
+
+router = APIRouter()
+
+@router.get('/pool', status_code=200)
+async def get_pool(user = Depends(get_current_admin)):
+    return {'status': Status.SUCCESS.value, 'pools': get_pool_stats()}
+
+@router.get('/cache', status_code=200)
+async def get_cache(user = Depends(get_current_admin)):
+    caches = {
+        'auth_users': user_cache.stats(),
+        'images': image_cache.stats(),
+        'responses': response_cache.stats(),
+        'analytics': analytics_cache.stats(),
+    }
+    return {'status': Status.SUCCESS.value, 'caches': caches}
+
+@router.get('/export/{entity}', status_code=200)
+async def export(entity: ExportEntity,
+                 format: ExportFormat = Query(ExportFormat.CSV),
+                 date_from: date | None = Query(None),
+                 date_to: date | None = Query(None),
+                 status: OrderStatus | None = Query(None),
+                 export_service: ExportService = Depends(get_export_service),
+                 user = Depends(get_current_admin)):
+    # Фильтры по дате заказа и статусу есть только у заказов
+    if entity != ExportEntity.ORDERS and (date_from or date_to or status):
+        raise HTTPException(status_code=400, detail={'status': Status.FAILED.value,
+                                                     'message': 'date_from, date_to and status apply to orders only'})
+    rows = export_service.export(entity, format, date_from, date_to, status.value if status else None)
+    filename = f'{entity.value}.{format.value}'
+    return StreamingResponse(rows, media_type=MEDIA_TYPES[format],
+                             headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@router.get('/analytics', status_code=200)
+async def get_analytics(date_from: date | None = Query(None),
+                        date_to: date | None = Query(None),
+                        top: int = Query(10, ge=1, le=100),
+                        analytics_service: AnalyticsService = Depends(get_analytics_service),
+                        user = Depends(get_current_admin)):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail={'status': Status.FAILED.value,
+                                                     'message': 'date_from must not be after date_to'})
+    analytics = await analytics_service.get_circulation(date_from, date_to, top)
+    return {'status': Status.SUCCESS.value, **analytics}
+
+@router.get('/overdue', status_code=200)
+async def get_overdue(id_user: int | None = Query(None),
+                      id_book: int | None = Query(None),
+                      response: Response = None,
+                      pagination: Pagination | None = Depends(get_pagination),
+                      overdue_service: OverdueService = Depends(get_overdue_service),
+                      user = Depends(get_current_admin)):
+    # Читается готовая таблица overdue_orders, которую заполняет сканер
+    filter = {k: v for k, v in {'id_user': id_user, 'id_book': id_book}.items() if v is not None}
+    orders = await overdue_service.get_overdue(pagination, **filter)
+    set_next_cursor(response, pagination)
+    return {'status': Status.SUCCESS.value, 'scan': overdue_service.get_stats(), 'orders': orders}
+
+@router.post('/overdue/scan', status_code=200)
+async def scan_overdue(overdue_service: OverdueService = Depends(get_overdue_service),
+                       user = Depends(get_current_admin)):
+    found = await overdue_service.scan()
+    # found = None: проход сейчас выполняет другой процесс
+    return {'status': Status.SUCCESS.value, 'found': found, 'skipped': found is None, 'scan': overdue_service.get_stats()}
+
@@ -5,19 +5,31 @@ from schemas.users import UserCreate, UserLogin
 from utils.enums import Status
 from datetime import timedelta
 from pydantic import EmailStr
+from sqlalchemy.exc import IntegrityError
 
 router = APIRouter()
 
+def is_duplicate_email(error: IntegrityError) -> bool:
+    # MySQL: Duplicate entry ... for key 'users.ux_users_email'; SQLite: UNIQUE constraint failed: users.email
+    message = str(error.orig)
+    return 'ux_users_email' in message or 'users.email' in message
+
 @router.post('/signup', status_code=201)
 async def signup(new_user: UserCreate, auth_service: AuthService = Depends(get_auth_service)):
-    user = auth_service.create_user(new_user)
+    try:
+        user = await auth_service.create_user(new_user)
+    except IntegrityError as error:
+        if not is_duplicate_email(error):
+            raise
+        raise HTTPException(status_code=409, detail={'status': Status.CONFLICT.value,
+                                                     'message': 'User with this email already exists'})
     if not user:
         raise HTTPException(status_code=400, detail={'status': Status.FAILED.value})
     return {'status': Status.SUCCESS.value}
 
 @router.post('/login', status_code=200)
 async def login(email: EmailStr = Form(...), password = Form(...), auth_service: AuthService = Depends(get_auth_service)):
-    token, update_token = auth_service.login(UserLogin(email=email, password=password))
+    token, update_token = await auth_service.login(UserLogin(email=email, password=password))
     response = JSONResponse(content=token)
     response.set_cookie(key='update_token', value=update_token, httponly=True, max_age=60*60*24*7)
     return response
@@ -27,7 +39,7 @@ async def refresh(request: Request, auth_service: AuthService = Depends(get_auth
     token = request.cookies.get('update_token')
     if not token:
         raise HTTPException(status_code=401, detail={'status': Status.UNAUTHORIZED.value})
-    new_token, update_token = auth_service.refresh_token(token)
+    new_token, update_token = await auth_service.refresh_token(token)
     response = JSONResponse(content=new_token)
     response.set_cookie(key='update_token', value=update_token, httponly=True, max_age=timedelta(days=60).total_seconds())
     return response
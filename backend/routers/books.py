@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Response
 from dependencies import *
 from schemas.books import *
-from schemas.authors import Author
-from utils.enums import Status
+from utils.enums import Status, ImportFormat, ListView
 from utils.image import save_image
+from utils.importer import detect_format
+from utils.pagination import Pagination, set_next_cursor
+from utils.serialization import json_response
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter()
@@ -11,11 +13,19 @@ router = APIRouter()
 @router.post('/', status_code=201)
 async def create_book(book_data: CreateBook,
                       book_service: BookService = Depends(get_book_service)):
-    new_book = book_service.create_book(book_data)
+    new_book = await book_service.create_book(book_data)
     if not new_book:
         raise HTTPException(status_code=400, detail={'status': Status.FAILED.value})
     return new_book
 
+@router.post('/import', status_code=200)
+async def import_books(file: UploadFile = File(...),
+                       format: ImportFormat | None = Query(None),
+                       user = Depends(get_current_admin),
+                       book_service: BookService = Depends(get_book_service)):
+    report = await book_service.import_books(file.file, format or detect_format(file.filename))
+    return {'status': Status.SUCCESS.value, **report}
+
 @router.get('/', status_code=200)
 async def get_all_books(name: str | None = Query(None),
                         description: str | None = Query(None),
@@ -24,73 +34,44 @@ async def get_all_books(name: str | None = Query(None),
                         ISBN: str | None = Query(None),
                         id_genre: int | None = Query(None),
                         id_author: int | None = Query(None),
-                        book_service: BookService = Depends(get_book_service),
-                        publisher_service: PublisherService = Depends(get_publisher_service),
-                        author_service: AuthorService = Depends(get_author_service)):
+                        view: ListView = Query(ListView.FULL),
+                        pagination: Pagination | None = Depends(pagination_params('name')),
+                        book_service: BookService = Depends(get_book_service)):
     filter = {k: v for k, v in locals().items() if v is not None 
-          and k not in {"book_service", "publisher_service", "author_service", "id_genre", "id_author"}}
-
-    books = book_service.get_all_books_filter_by(id_author=id_author, id_genre=id_genre, **filter)
-    response = []
-    for book in books:
-        publisher = publisher_service.get_one_publisher_filter_by(id=book.id_publisher)
-
-        authors = author_service.get_all_authors_filter_by(id_book=book.id)
-        authors_list = [Author(**author.__dict__) for author in authors]
-
-        genres = book_service.get_all_genres_filter_by(id_book=book.id)
-        genres_list = [Genre(**genre.__dict__) for genre in genres]
-
-        book_data = book.__dict__
-        book_data.update({
-            'authors': authors_list,
-            'publisher': publisher.__dict__,
-            'genres': genres_list,
-        })
-        response.append(Book(**book_data))
+          and k not in {"book_service", "id_genre", "id_author", "pagination", "view"}}
+    if view == ListView.SUMMARY:
+        books = await book_service.get_catalog_summary_filter_by(pagination=pagination, id_author=id_author, id_genre=id_genre, **filter)
+        response = json_response(BookSummaryList, books)
+    else:
+        books = await book_service.get_catalog_filter_by(pagination=pagination, id_author=id_author, id_genre=id_genre, **filter)
+        response = Response(content=books, media_type='application/json')
+    set_next_cursor(response, pagination)
     return response
 
 @router.get('/{id}', status_code=200)
-async def get_book(id: int, book_service: BookService = Depends(get_book_service),
-                   publisher_service: PublisherService = Depends(get_publisher_service),
-                   author_service: AuthorService = Depends(get_author_service)):
-    book = book_service.get_one_book_filter_by(id=id)
+async def get_book(id: int, book_service: BookService = Depends(get_book_service)):
+    book = await book_service.get_one_catalog_book(id)
     if not book:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    publisher = publisher_service.get_one_publisher_filter_by(id=book.id_publisher)
-
-    authors = author_service.get_all_authors_filter_by(id_book=book.id)
-    authors_list = [Author(**author.__dict__) for author in authors]
-
-    genres = book_service.get_all_genres_filter_by(id_book=book.id)
-    genres_list = [Genre(**genre.__dict__) for genre in genres]
-
-    book_data = book.__dict__
-    book_data.update({
-        'authors': authors_list,
-        'publisher': publisher.__dict__,
-        'genres': genres_list,
-    })
-    book = Book(**book_data)
-    return book
+    return Response(content=book, media_type='application/json')
 
 @router.put('/{id}', status_code=200)
 async def update_book(id: int, 
                       update_data: UpdateBook,
                       book_service: BookService = Depends(get_book_service)):
-    book = book_service.get_one_book_filter_by(id=id)
+    book = await book_service.get_one_book_filter_by(id=id)
     if book is None:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    book_update = book_service.update_book(id, update_data)
+    book_update = await book_service.update_book(id, update_data)
     return book_update
 
 @router.delete('/{id}', status_code=200)
 async def delete_book(id: int, book_service: BookService = Depends(get_book_service)):
-    book = book_service.get_one_book_filter_by(id=id)
+    book = await book_service.get_one_book_filter_by(id=id)
     if book is None:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
     try:
-        book_service.delete_book(id=id)
+        await book_service.delete_book(id=id)
         return {'status': Status.SUCCESS.value, 'message': f'Book with id {id} deleted successfully'}
     except IntegrityError as e:
         # Обработка ошибки внешнего ключа
@@ -105,9 +86,9 @@ async def delete_book(id: int, book_service: BookService = Depends(get_book_serv
 @router.patch('/{id}/image', status_code=200)
 async def update_book_image(id: int, image: UploadFile = File(...),
                             book_service: BookService = Depends(get_book_service)):
-    book = book_service.get_one_book_filter_by(id=id)
+    book = await book_service.get_one_book_filter_by(id=id)
     if not book:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    upd_book = book_service.update_book(id, UpdateBook(image=image.filename))
-    image_name = save_image(image)
+    image_name = await save_image(image)
+    upd_book = await book_service.update_book(id, UpdateBook(image=image_name))
     return {'status': Status.SUCCESS.value, 'update_image': image_name}
\ No newline at end of file
@@ -1,66 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
-from dependencies import get_publisher_service, PublisherService, get_book_service, BookService
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Request
+from dependencies import get_publisher_service, PublisherService, get_book_service, BookService, pagination_params
 from schemas.publishers import *
-from utils.enums import Status
+from utils.enums import Status, ListView
 from utils.image import save_image
+from utils.pagination import Pagination
+from utils.response_cache import cached_response
 
 router = APIRouter()
 
 @router.post('/', status_code=201)
 async def create_publisher(new_publisher_data: CreatePublisher,
                            publisher_service: PublisherService = Depends(get_publisher_service)):
-    new_publisher = publisher_service.create_publisher(new_publisher_data)
+    new_publisher = await publisher_service.create_publisher(new_publisher_data)
     if not new_publisher:
         raise HTTPException(status_code=400, detail={'status': Status.FAILED.value})
-    return {'status': Status.SUCCESS.value, 'new_publisher': new_publisher.__dict__}
+    return {'status': Status.SUCCESS.value, 'new_publisher': Publisher.model_validate(new_publisher)}
 
 @router.get('/', status_code=200)
-async def get_all_publishers(name: str | None = Query(None),
+async def get_all_publishers(request: Request,
+                             name: str | None = Query(None),
                              image: str | None = Query(None),
                              description: str | None = Query(None),
                              foundation_year: int | None = Query(None),
+                             view: ListView = Query(ListView.FULL),
+                             pagination: Pagination | None = Depends(pagination_params('name')),
                              publisher_service: PublisherService = Depends(get_publisher_service)):
-    filter = {k: v for k, v in locals().items() if v is not None and k != "publisher_service"}
-    publishers = publisher_service.get_all_publisher_filter_by(**filter)
-    response = [Publisher(**publisher.__dict__) for publisher in publishers]
-    return response
+    filter = {k: v for k, v in locals().items() if v is not None 
+              and k not in {"publisher_service", "request", "pagination", "view"}}
+
+    async def load():
+        return await publisher_service.get_all_publisher_filter_by(pagination=pagination, view=view, **filter)
+    adapter = PublisherSummaryList if view == ListView.SUMMARY else PublisherList
+    return await cached_response('publishers', request, pagination, load, adapter)
 
 @router.get('/{id}', status_code=200)
 async def get_publisher(id: int, publisher_service: PublisherService = Depends(get_publisher_service)):
-    publisher = publisher_service.get_one_publisher_filter_by(id=id)
+    publisher = await publisher_service.get_one_publisher_filter_by(id=id)
     if not publisher:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    return {'status': Status.SUCCESS.value, 'new_publisher':Publisher(**publisher.__dict__)}
+    return {'status': Status.SUCCESS.value, 'new_publisher': Publisher.model_validate(publisher)}
 
 @router.put('/{id}', status_code=200)
 async def update_publisher(id: int, upd_data: UpdatePublisher,
                            publisher_service: PublisherService = Depends(get_publisher_service)):
-    publisher = publisher_service.get_one_publisher_filter_by(id=id)
+    publisher = await publisher_service.get_one_publisher_filter_by(id=id)
     if not publisher:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    upd_publisher = publisher_service.update_publisher(id, upd_data)
+    upd_publisher = await publisher_service.update_publisher(id, upd_data)
     return {'status': Status.SUCCESS.value, 'update_publisher': upd_publisher}
 
 @router.delete('/{id}', status_code=200)
 async def delete_publisher(id: int, 
                            publisher_service: PublisherService = Depends(get_publisher_service),
                            book_service: BookService = Depends(get_book_service)):
-    publisher = publisher_service.get_one_publisher_filter_by(id=id)
+    publisher = await publisher_service.get_one_publisher_filter_by(id=id)
     if not publisher:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    books_publisher = book_service.get_all_books_filter_by(id_publisher=id)
+    books_publisher = await book_service.get_all_books_filter_by(id_publisher=id)
     if books_publisher:
         for book in books_publisher:
-            book_service.delete_book(book.id)
-    publisher_delete = publisher_service.delete_publisher(id)
+            await book_service.delete_book(book.id)
+    publisher_delete = await publisher_service.delete_publisher(id)
     return {'status': Status.SUCCESS.value}
 
 @router.patch('/{id}/image', status_code=200)
 async def update_publisher_image(id: int, image: UploadFile = File(...),
                                  publisher_service: PublisherService = Depends(get_publisher_service)):
-    publisher = publisher_service.get_one_publisher_filter_by(id=id)
+    publisher = await publisher_service.get_one_publisher_filter_by(id=id)
     if not publisher:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    upd_publisher = publisher_service.update_publisher(id, UpdatePublisher(image=image.filename))
-    image_name = save_image(image)
+    image_name = await save_image(image)
+    upd_publisher = await publisher_service.update_publisher(id, UpdatePublisher(image=image_name))
     return {'status': Status.SUCCESS.value, 'update_image': image_name}
\ No newline at end of file
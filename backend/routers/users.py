@@ -1,22 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from dependencies import UserService, get_user_service, get_current_user
+from dependencies import UserService, get_user_service, get_current_user, pagination_params
 from schemas.users import *
 from utils.enums import AuthStatus, Roles, Status
+from utils.pagination import Pagination, set_next_cursor
+from utils.serialization import json_response
 
 router = APIRouter()
 
 @router.get('/me')
 async def get_me(user_service: UserService = Depends(get_user_service), 
                  user = Depends(get_current_user)):
-    user_info = user_service.get_user_filter_by(id=user.id)
+    user_info = await user_service.get_user_details(id=user.id)
     if not user_info:
         raise HTTPException(status_code=404, detail={'status': AuthStatus.USER_NOT_FOUND.value})
-    return UserResponse(**user_info.__dict__)
+    return UserResponse.model_validate(user_info)
 
-@router.get('/{id}', status_code=200)
+@router.get('/all')
+async def get_all_users(pagination: Pagination | None = Depends(pagination_params('email')),
+                        user_service: UserService = Depends(get_user_service), 
+                        user = Depends(get_current_user)):
+    if user.role != Roles.ADMIN.value:
+        raise HTTPException(status_code=403, detail={'status': AuthStatus.FORBIDDEN.value})
+    users = await user_service.get_all_users_details(pagination=pagination)
+    # Через UserResponse: хеш пароля в ответ не попадает
+    response = json_response(UserResponseList, users)
+    set_next_cursor(response, pagination)
+    return response
+
+@router.get('/{id:int}', status_code=200)
 async def get_user(id: int, user_service: UserService = Depends(get_user_service)):
-    user = user_service.get_user_filter_by(id=id)
-    return UserResponse(**user.__dict__)
+    user = await user_service.get_user_details(id=id)
+    if not user:
+        raise HTTPException(status_code=404, detail={'status': AuthStatus.USER_NOT_FOUND.value})
+    return UserResponse.model_validate(user)
 
 @router.put('/')
 async def update_user(data: UserUpdate, 
@@ -27,22 +43,16 @@ async def update_user(data: UserUpdate,
         user_id = user.id
     if not user_id == user.id and user.role != Roles.ADMIN.value:
         raise HTTPException(status_code=403, detail={'status': AuthStatus.FORBIDDEN.value})
-    update_user = user_service.update(user_id, data)
-    return {'status': Status.SUCCESS.value, 'data': update_user}
-
-@router.get('/all')
-async def get_all_users(user_service: UserService = Depends(get_user_service), 
-                        user = Depends(get_current_user)):
-    if user.role != Roles.ADMIN.value:
-        raise HTTPException(status_code=403, detail={'status': AuthStatus.FORBIDDEN.value})
-    users = user_service.get_all_users_filter_by()
-    return {'status': Status.SUCCESS.value, 'data': users}
+    update_user = await user_service.update(user_id, data)
+    if not update_user:
+        raise HTTPException(status_code=404, detail={'status': AuthStatus.USER_NOT_FOUND.value})
+    return {'status': Status.SUCCESS.value, 'data': UserResponse.model_validate(update_user)}
 
 @router.put('/updatename')
 async def update_current_user(name: str, user_service: UserService = Depends(get_user_service), user = Depends(get_current_user)):
     data = UserUpdate(name=name)
-    updated_user = user_service.update(user.id, data)
-    return {'status': Status.SUCCESS.value, 'data': updated_user}
+    updated_user = await user_service.update(user.id, data)
+    return {'status': Status.SUCCESS.value, 'data': UserResponse.model_validate(updated_user)}
 
 @router.delete('/')
 async def delete_user(user_id: int = Query(None), user_service: UserService = Depends(get_user_service), user = Depends(get_current_user)):
@@ -50,7 +60,7 @@ async def delete_user(user_id: int = Query(None), user_service: UserService = De
         user_id = user.id
     if not user_id == user.id and user.role != Roles.ADMIN.value:
         raise HTTPException(status_code=403, detail={'status': AuthStatus.FORBIDDEN.value})
-    user_service.delete_user(user_id)
+    await user_service.delete_user(user_id)
     return {'status': Status.SUCCESS.value}
 
 
@@ -58,13 +68,13 @@ async def delete_user(user_id: int = Query(None), user_service: UserService = De
 @router.get('/school_classes', status_code=200)
 async def get_all_school_classes(name: str | None = Query(None),
                                  user_service: UserService = Depends(get_user_service)):
-    school_classes = user_service.get_all_school_classes(name=name)
-    response = [SchoolClass(**school_class.__dict__) for school_class in school_classes]
-    return response
+    filter = {'name': name} if name is not None else {}
+    school_classes = await user_service.get_all_school_classes_filter_by(**filter)
+    return json_response(SchoolClassList, school_classes)
 
 @router.get('/school_classes/{id}', status_code=200)
 async def get_school_class(id: int, user_service: UserService = Depends(get_user_service)):
-    school_class = user_service.get_one_school_class(id=id)
+    school_class = await user_service.get_one_school_class_filter_by(id=id)
     if not school_class:
         raise HTTPException(status_code=404, detail={'status': Status.NOT_FOUND.value})
-    return {'status': Status.SUCCESS.value, 'school_class': SchoolClass(**school_class.__dict__)}
+    return {'status': Status.SUCCESS.value, 'school_class': SchoolClass.model_validate(school_class)}
@@ -1,15 +1,29 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from typing import Optional, List
 from datetime import date
 
 class Author(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     image: str
-    birth_date: date
+    birth_date: Optional[date] = None
     death_date: Optional[date] = None
     bio: str
 
+AuthorList = TypeAdapter(List[Author])
+
+# view=summary: без биографии и дат
+class AuthorSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    image: str
+
+AuthorSummaryList = TypeAdapter(List[AuthorSummary])
+
 class CreateAuthor(BaseModel):
     name: str
     birth_date: date
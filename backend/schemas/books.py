@@ -1,13 +1,17 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from typing import Optional, List
 from datetime import datetime
-from schemas.authors import Author
+from schemas.authors import Author, AuthorSummary
 from schemas.publishers import Publisher
 
 class Genre(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
 
+GenreList = TypeAdapter(List[Genre])
+
 class CreateGenre(BaseModel):
     name: str
 
@@ -51,7 +55,39 @@ class UpdateBook(BaseModel):
             raise ValueError(f'Year must be between 1000 and {current_year}')
         return value
 
+class ImportBook(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    description: str = ''
+    authors: List[str] = []
+    genres: List[str] = []
+    publisher: str = Field(min_length=1, max_length=255)
+    year: int
+    ISBN: str = Field(max_length=255)
+    count: int = Field(0, ge=0)
+
+    # В CSV имена перечисляются через ';'
+    @field_validator('authors', 'genres', mode='before')
+    def split_names(cls, value):
+        if isinstance(value, str):
+            value = value.split(';')
+        return list(dict.fromkeys(name.strip() for name in value if name and name.strip()))
+
+    @field_validator('authors', 'genres')
+    def validate_names(cls, value):
+        if any(len(name) > 255 for name in value):
+            raise ValueError('Name must be at most 255 characters')
+        return value
+
+    @field_validator('year')
+    def validate_year(cls, value):
+        current_year = datetime.now().year
+        if not (1000 <= value <= current_year):
+            raise ValueError(f'Year must be between 1000 and {current_year}')
+        return value
+
 class Book(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     description: str
@@ -63,7 +99,28 @@ class Book(BaseModel):
     ISBN: str
     count: int
 
+# view=summary: карточка в сетке каталога без описаний книги, авторов и издательства
+class BookSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    image: str
+    authors: List[AuthorSummary]
+    count: int
+
+BookSummaryList = TypeAdapter(List[BookSummary])
+
+class BookTitle(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    image: str
+
 class BookOrder(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     description: str
@@ -1,11 +1,13 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from datetime import date
 from utils.enums import OrderStatus
-from typing import Optional
-from schemas.users import UserResponse
-from schemas.books import BookOrder
+from typing import Optional, List
+from schemas.users import UserResponse, UserSummary
+from schemas.books import BookOrder, BookTitle
 
 class Order(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     user: UserResponse
     book: BookOrder
@@ -15,6 +17,22 @@ class Order(BaseModel):
     return_date: Optional[date] = None
     status: OrderStatus
 
+OrderList = TypeAdapter(List[Order])
+
+# view=summary: пользователь и книга только с названиями
+class OrderSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user: UserSummary
+    book: BookTitle
+    order_date: date
+    due_date: date
+    return_date: Optional[date] = None
+    status: OrderStatus
+
+OrderSummaryList = TypeAdapter(List[OrderSummary])
+
 class CreateOrder(BaseModel):
     id_book: int
     due_date: date
@@ -1,13 +1,26 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from typing import Optional, List
 from datetime import datetime
 
 class Publisher(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     image: str
     description: str
-    foundation_year: int
+    foundation_year: Optional[int] = None
+
+PublisherList = TypeAdapter(List[Publisher])
+
+class PublisherSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    image: str
+
+PublisherSummaryList = TypeAdapter(List[PublisherSummary])
 
 class CreatePublisher(BaseModel):
     name: str
@@ -1,11 +1,15 @@
-from pydantic import BaseModel, Field, field_validator, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, EmailStr
 import re
-from typing import Optional
+from typing import Optional, List
 
 class SchoolClass(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
 
+SchoolClassList = TypeAdapter(List[SchoolClass])
+
 class CreateSchoolClass(BaseModel):
     name: str
     
@@ -73,6 +77,8 @@ class UserLogin(BaseModel):
         return val
     
 class User(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     school_class: Optional[SchoolClass] = None 
@@ -80,9 +86,25 @@ class User(BaseModel):
     email: str
     password: str
 
+class CurrentUser(BaseModel):
+    # Пользователь из токена, хранится в кэше авторизации - без хеша пароля
+    id: int
+    name: str
+    role: str
+    email: str
+
+class UserSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+
 class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
-    school_class: Optional[SchoolClass] = None 
+    school_class: Optional[SchoolClass] = None
     email: str
-    school_class: Optional[str] = None 
\ No newline at end of file
+
+UserResponseList = TypeAdapter(List[UserResponse])
@@ -3,4 +3,7 @@ from .auth import AuthService
 from .books import BookService
 from .authors import AuthorService
 from .publishers import PublisherService
-from .orders import OrderService
\ No newline at end of file
+from .orders import OrderService
+from .exports import ExportService
+from .analytics import AnalyticsService
+from .overdue import OverdueService, OverdueScanner
\ No newline at end of file
@@ -0,0 +1,39 @@
+from datetime import date
+from config.cache import ANALYTICS_CACHE_SIZE, ANALYTICS_CACHE_TTL
+from utils.abstract_repository import AsyncIREpository
+from utils.cache import TTLCache
+
+analytics_cache = TTLCache(maxsize=ANALYTICS_CACHE_SIZE, ttl=ANALYTICS_CACHE_TTL)
+
+
+def with_rates(rows: list[dict]) -> list[dict]:
+    for row in rows:
+        # SUM по пустой группе в некоторых БД даёт NULL
+        for key in ('loans', 'returns', 'overdue'):
+            row[key] = int(row[key] or 0)
+        row['overdue_rate'] = round(row['overdue'] / row['loans'], 4) if row['loans'] else 0.0
+    return rows
+
+
+class AnalyticsService:
+    def __init__(self, analytics_repository: AsyncIREpository):
+        self.analytics_repository = analytics_repository
+
+    async def get_circulation(self, date_from: date = None, date_to: date = None, top: int = 10) -> dict:
+        # Просрочка зависит от текущей даты, поэтому она тоже входит в ключ
+        today = date.today()
+        key = (date_from, date_to, top, today)
+        result = analytics_cache.get(key)
+        if result is not None:
+            return result
+        repository = self.analytics_repository
+        result = {
+            'date_from': date_from,
+            'date_to': date_to,
+            'by_school_class': with_rates(await repository.by_school_class(today, date_from, date_to)),
+            'by_genre': with_rates(await repository.by_genre(today, date_from, date_to)),
+            'by_month': with_rates(await repository.by_month(today, date_from, date_to)),
+            'top_books': await repository.top_books(top, date_from, date_to),
+        }
+        analytics_cache.set(key, result)
+        return result
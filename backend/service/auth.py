@@ -1,25 +1,34 @@
 from fastapi import HTTPException
 from utils.enums import AuthStatus
-from passlib.hash import pbkdf2_sha256
 from datetime import datetime, timedelta
 import jwt
-from config.auth import SECRET_KEY, ALGORITHM, UPDATE_EXPIRATION_TIME, EXPIRATION_TIME
-from crud.users import UserRepository
-from schemas.users import UserCreate, User, UserLogin
+from config.auth import SECRET_KEY, ALGORITHM, UPDATE_EXPIRATION_TIME, EXPIRATION_TIME, AUTH_CACHE_SIZE, AUTH_CACHE_TTL
+from utils.abstract_repository import AsyncIREpository
+from schemas.users import UserCreate, User, UserLogin, CurrentUser
+from utils.cache import TTLCache
+from utils.passwords import hash_password, verify_and_update_password
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# (id пользователя, токен) -> CurrentUser; сбрасывается в UserService.update/delete_user
+user_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+def invalidate_user_cache(user_id: int):
+    user_cache.delete_where(lambda key: key[0] == user_id)
+
 class AuthService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: AsyncIREpository):
         self.user_repository = user_repository
 
-    def create_user(self, user: UserCreate):
-        user.password = pbkdf2_sha256.hash(user.password)
-        return self.user_repository.add(user.model_dump())
+    async def create_user(self, user: UserCreate):
+        user.password = await hash_password(user.password)
+        # Повторный email отклоняет уникальный индекс ux_users_email, транзакция откатывается
+        async with self.user_repository.transaction():
+            return await self.user_repository.add(user.model_dump())
 
-    def get_user_filter_by(self, **filter_by):
-        return self.user_repository.get_one_filter_by(**filter_by)
+    async def get_user_filter_by(self, **filter_by):
+        return await self.user_repository.get_one_filter_by(**filter_by)
 
 
     def gen_token(self, user: User):
@@ -36,24 +45,34 @@ class AuthService:
         except jwt.InvalidTokenError:
             raise HTTPException(status_code=401, detail={'status': AuthStatus.INVALID_TOKEN.value})
 
-    def get_user_by_token(self, token: str):
+    async def get_user_by_token(self, token: str):
         payload = self.decode_token(token)
-        user = self.get_user_filter_by(id=payload['sub'])
+        key = (payload['sub'], token)
+        user = user_cache.get(key)
+        if user:
+            return user
+        user = await self.get_user_filter_by(id=payload['sub'])
         if not user:
             raise HTTPException(status_code=401, detail={'status': AuthStatus.USER_NOT_FOUND.value})
+        user = CurrentUser(id=user.id, name=user.name, role=user.role, email=user.email)
+        user_cache.set(key, user)
         return user
     
     def gen_update_token(self, user: User):
         payload = {"sub": user.id, "exp": datetime.now() + UPDATE_EXPIRATION_TIME}
         return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
     
-    def login(self, user_login: UserLogin):
-        user = self.get_user_filter_by(email=user_login.email)
+    async def login(self, user_login: UserLogin):
+        user = await self.get_user_filter_by(email=user_login.email)
         print(f"User from DB: {user}")
         if not user:
             raise HTTPException(status_code=401, detail={'status': AuthStatus.INVALID_EMAIL_OR_PASSWORD.value})
-        if not pbkdf2_sha256.verify(user_login.password, user.password):
+        valid, new_hash = await verify_and_update_password(user_login.password, user.password)
+        if not valid:
             raise HTTPException(status_code=401, detail={'status': AuthStatus.INVALID_EMAIL_OR_PASSWORD.value})
+        if new_hash:
+            # Число раундов изменилось - сохраняем хеш с новой стоимостью
+            await self.user_repository.update({'id': user.id, 'password': new_hash})
         token = self.gen_token(user)
         return {
             'access_token': token,
@@ -61,9 +80,9 @@ class AuthService:
             'expires': EXPIRATION_TIME.total_seconds()
         }, self.gen_update_token(user)
 
-    def refresh_token(self, token: str):
+    async def refresh_token(self, token: str):
         payload = self.decode_token(token)
-        user = self.get_user_filter_by(id=payload['sub'])
+        user = await self.get_user_filter_by(id=payload['sub'])
         if not user:
             raise HTTPException(status_code=401, detail={'status': AuthStatus.USER_NOT_FOUND.value})
         token = self.gen_token(user)
@@ -1,41 +1,46 @@
-from utils.abstract_repository import IREpository
-from models.books import *
-from models.authors import AuthorBook, Author
+from utils.abstract_repository import AsyncIREpository
 from schemas.authors import CreateAuthor, UpdateAuthor
-from dependencies import AuthorRepository, BookRepository
-from utils.enums import Status
+from utils.enums import Status, ListView
+from utils.pagination import Pagination
+from utils.response_cache import response_cache
 
 class AuthorService:
-    def __init__(self, author_repository: AuthorRepository,
-                 book_author_assoc_repository: BookRepository):
+    def __init__(self, author_repository: AsyncIREpository,
+                 book_author_assoc_repository: AsyncIREpository,
+                 book_card_repository: AsyncIREpository):
         self.author_repository = author_repository
         self.book_author_assoc_repository = book_author_assoc_repository
+        self.book_card_repository = book_card_repository
 
-    def get_all_authors_filter_by(self, id_book: int = None, **filter):
-        query = self.author_repository.session.query(Author)
-        if id_book:
-            query = query.join(AuthorBook).filter(AuthorBook.id_book == id_book)
-        for attr, value in filter.items():
-            query = query.filter(getattr(Author, attr) == value)
-        authors = query.all()
-        return authors
+    async def get_all_authors_filter_by(self, pagination: Pagination = None, id_book: int = None,
+                                        view: ListView = ListView.FULL, **filter):
+        return await self.author_repository.get_all_authors_filter_by(pagination, id_book=id_book, view=view, **filter)
     
-    def get_one_author_filter_by(self, **filter):
-        return self.author_repository.get_one_filter_by(**filter)
+    async def get_one_author_filter_by(self, **filter):
+        return await self.author_repository.get_one_filter_by(**filter)
     
-    def create_author(self, create_data: CreateAuthor):
-        author_data = self.author_repository.add(create_data.model_dump())
+    async def create_author(self, create_data: CreateAuthor):
+        author_data = await self.author_repository.add(create_data.model_dump())
         if not author_data:
             return Status.FAILED.value
+        response_cache.bump('authors')
         return author_data
     
-    def update_author(self, id: int, data: UpdateAuthor):
+    async def update_author(self, id: int, data: UpdateAuthor):
         entity = data.model_dump()
         entity['id'] = id
         entity = {k: v for k, v in entity.items() if v is not None}
-        upd_author = self.author_repository.update(entity)
+        async with self.author_repository.transaction():
+            upd_author = await self.author_repository.update(entity)
+            await self.book_card_repository.refresh(await self.book_card_repository.get_book_ids(id_author=id))
+        response_cache.bump('authors')
         return upd_author
     
-    def delete_author(self, id: int):
-        self.book_author_assoc_repository.session.query(AuthorBook).filter_by(id_author=id).delete()
-        return self.author_repository.delete(id)
\ No newline at end of file
+    async def delete_author(self, id: int):
+        async with self.author_repository.transaction():
+            ids_book = await self.book_card_repository.get_book_ids(id_author=id)
+            await self.book_author_assoc_repository.delete_by_filter(id_author=id)
+            result = await self.author_repository.delete(id)
+            await self.book_card_repository.refresh(ids_book)
+        response_cache.bump('authors')
+        return result
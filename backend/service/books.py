@@ -1,62 +1,69 @@
-from utils.abstract_repository import IREpository
-from models.books import *
-from models.authors import *
-from models.orders import Order
-from dependencies import BookRepository
-from schemas.books import CreateBook, UpdateBook, CreateGenre, UpdateGenre
-from utils.enums import Status
-from sqlalchemy.orm import joinedload
+from typing import BinaryIO
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from config.database import IMPORT_CHUNK_SIZE
+from utils.abstract_repository import AsyncIREpository
+from schemas.books import CreateBook, UpdateBook, CreateGenre, UpdateGenre, ImportBook
+from utils.enums import Status, ImportFormat
+from utils.importer import read_rows, next_chunk
+from utils.pagination import Pagination
+from utils.response_cache import response_cache
 
 class BookService:
-    def __init__(self, book_repository: BookRepository,
-                 book_genre_repository: BookRepository,
-                 book_genre_assoc_repository: BookRepository,
-                 book_author_assoc_repository: BookRepository):
+    def __init__(self, book_repository: AsyncIREpository,
+                 book_genre_repository: AsyncIREpository,
+                 book_genre_assoc_repository: AsyncIREpository,
+                 book_author_assoc_repository: AsyncIREpository,
+                 book_card_repository: AsyncIREpository):
         self.book_repository = book_repository
         self.book_genre_repository = book_genre_repository
         self.book_genre_assoc_repository = book_genre_assoc_repository
         self.book_author_assoc_repository = book_author_assoc_repository
+        self.book_card_repository = book_card_repository
 
     # Book
-    def get_all_books_filter_by(self, id_author: int = None, id_genre: int = None, **filter):
-        query = self.book_repository.session.query(Book).options(
-            joinedload(Book.author_book),
-            joinedload(Book.genre_book)
-        )
-        if id_author:
-            query = query.join(AuthorBook, AuthorBook.id_book == Book.id).filter(AuthorBook.id_author == id_author)
-        if id_genre:
-            query = query.join(GenreBook, GenreBook.id_book == Book.id).filter(GenreBook.id_genre == id_genre)
-        books = query.filter_by(**filter).all()
-        return books
+    async def get_all_books_filter_by(self, id_author: int = None, id_genre: int = None, **filter):
+        return await self.book_repository.get_all_books_filter_by(id_author=id_author, id_genre=id_genre, **filter)
     
-    def get_one_book_filter_by(self, **filter):
-        return self.book_repository.get_one_filter_by(**filter)
+    async def get_one_book_filter_by(self, **filter):
+        return await self.book_repository.get_one_filter_by(**filter)
+
+    # Каталог отдаётся готовым JSON из карточек, без сборки схем на каждый запрос
+    async def get_catalog_filter_by(self, pagination: Pagination = None, id_author: int = None, id_genre: int = None, **filter) -> bytes:
+        documents = await self.book_repository.get_catalog_filter_by(pagination, id_author=id_author, id_genre=id_genre, **filter)
+        return f"[{','.join(documents)}]".encode()
+
+    async def get_catalog_summary_filter_by(self, pagination: Pagination = None, id_author: int = None, id_genre: int = None, **filter):
+        return await self.book_repository.get_catalog_summary_filter_by(pagination, id_author=id_author, id_genre=id_genre, **filter)
+
+    async def get_one_catalog_book(self, id: int) -> bytes | None:
+        document = await self.book_card_repository.get_document(id)
+        if document is None:
+            return None
+        return document.encode()
     
-    def create_book(self, create_data: CreateBook):
+    async def create_book(self, create_data: CreateBook):
         create_data_dict = create_data.model_dump()
         ids_author = create_data_dict.pop('ids_author')
         ids_genre = create_data_dict.pop('ids_genre')
-        new_book = self.book_repository.add(create_data_dict)
-        if not new_book:
-            return Status.FAILED.value
-        
-        for author_id in create_data.ids_author:
-            assoc_data = {
-                'id_book': new_book.id,
-                'id_author': author_id
-            }
-            self.book_author_assoc_repository.add(assoc_data)
+        async with self.book_repository.transaction():
+            new_book = await self.book_repository.add(create_data_dict)
+            if not new_book:
+                return Status.FAILED.value
 
-        for genre_id in create_data.ids_genre:
-            assoc_data = {
-                'id_book': new_book.id,
-                'id_genre': genre_id
-            }
-            self.book_genre_assoc_repository.add(assoc_data)
+            if ids_author:
+                await self.book_author_assoc_repository.add_all(
+                    [{'id_book': new_book.id, 'id_author': author_id} for author_id in ids_author])
+            if ids_genre:
+                await self.book_genre_assoc_repository.add_all(
+                    [{'id_book': new_book.id, 'id_genre': genre_id} for genre_id in ids_genre])
+            await self.book_card_repository.refresh([new_book.id])
+        # Списки авторов и жанров фильтруются по id_book
+        response_cache.bump('authors', 'genres')
         return new_book
     
-    def update_book(self, id: int, data: UpdateBook):
+    async def update_book(self, id: int, data: UpdateBook):
         entity = data.model_dump()
         entity['id'] = id
 
@@ -64,63 +71,96 @@ class BookService:
         ids_genre = entity.pop('ids_genre')
 
         entity = {k: v for k, v in entity.items() if v is not None}
-        upd_book = self.book_repository.update(entity)
-        if not upd_book:
-            return Status.FAILED.value
-        
-        if ids_author is not None:
-            self.book_author_assoc_repository.session.query(AuthorBook).filter_by(id_book=id).delete()
-            for author_id in ids_author:
-                assoc_data = {
-                    'id_book': id,
-                    'id_author': author_id
-                }
-                self.book_author_assoc_repository.add(assoc_data)
+        async with self.book_repository.transaction():
+            upd_book = await self.book_repository.update(entity)
+            if not upd_book:
+                return Status.FAILED.value
 
-        if ids_genre is not None:
-            self.book_genre_assoc_repository.session.query(GenreBook).filter_by(id_book=id).delete()
-            for genre_id in ids_genre:
-                assoc_data = {
-                    'id_book': id,
-                    'id_genre': genre_id
-                }
-                self.book_genre_assoc_repository.add(assoc_data)
+            if ids_author is not None:
+                await self.book_author_assoc_repository.delete_by_filter(id_book=id)
+                if ids_author:
+                    await self.book_author_assoc_repository.add_all(
+                        [{'id_book': id, 'id_author': author_id} for author_id in ids_author])
 
+            if ids_genre is not None:
+                await self.book_genre_assoc_repository.delete_by_filter(id_book=id)
+                if ids_genre:
+                    await self.book_genre_assoc_repository.add_all(
+                        [{'id_book': id, 'id_genre': genre_id} for genre_id in ids_genre])
+            await self.book_card_repository.refresh([id])
+        response_cache.bump('authors', 'genres')
         return upd_book
     
-    def delete_book(self, id: int):
-        self.book_author_assoc_repository.session.query(AuthorBook).filter_by(id_book=id).delete()
-        self.book_genre_assoc_repository.session.query(GenreBook).filter_by(id_book=id).delete()
-        return self.book_repository.delete(id)
+    async def delete_book(self, id: int):
+        async with self.book_repository.transaction():
+            await self.book_author_assoc_repository.delete_by_filter(id_book=id)
+            await self.book_genre_assoc_repository.delete_by_filter(id_book=id)
+            await self.book_card_repository.delete_by_filter(id_book=id)
+            result = await self.book_repository.delete(id)
+        response_cache.bump('authors', 'genres')
+        return result
     
+    async def import_books(self, file: BinaryIO, import_format: ImportFormat) -> dict:
+        report = {'imported': 0, 'failed': 0, 'created': {'authors': 0, 'genres': 0, 'publishers': 0}, 'errors': []}
+        rows = read_rows(file, import_format)
+        # Чтение файла блокирует, поэтому пачки читаются в пуле потоков
+        while chunk := await run_in_threadpool(next_chunk, rows, IMPORT_CHUNK_SIZE):
+            books, lines = [], []
+            for line, row in chunk:
+                try:
+                    book = ImportBook.model_validate_json(row) if isinstance(row, str) else ImportBook.model_validate(row)
+                except ValidationError as e:
+                    errors = [f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}" for error in e.errors()]
+                    report['errors'].append({'row': line, 'errors': errors})
+                    continue
+                books.append(book.model_dump())
+                lines.append(line)
+            if not books:
+                continue
+            try:
+                created = await self.book_repository.import_books(books)
+            except SQLAlchemyError as e:
+                # Пачка откатывается целиком, каждая её строка попадает в отчёт
+                message = str(getattr(e, 'orig', None) or e)
+                report['errors'].extend({'row': line, 'errors': [message]} for line in lines)
+                continue
+            report['imported'] += len(books)
+            for name, count in created.items():
+                report['created'][name] += count
+        report['failed'] = len(report['errors'])
+        if report['imported']:
+            response_cache.bump('authors', 'genres', 'publishers')
+        return report
+
     # Genre
-    def get_all_genres_filter_by(self, id_book: int = None, **filter):
-        query = self.book_genre_repository.session.query(Genre)
-        if id_book:
-            query = query.join(GenreBook).filter(GenreBook.id_book == id_book)
-        for attr, value in filter.items():
-            query = query.filter(getattr(Author, attr) == value)
-        genres = query.all()
-        return genres
+    async def get_all_genres_filter_by(self, pagination: Pagination = None, id_book: int = None, **filter):
+        return await self.book_genre_repository.get_all_genres_filter_by(pagination, id_book=id_book, **filter)
     
-    def get_one_genre_filter_by(self, **filter):
-        return self.book_genre_repository.get_one_filter_by(**filter)
+    async def get_one_genre_filter_by(self, **filter):
+        return await self.book_genre_repository.get_one_filter_by(**filter)
     
-    def create_genre(self, create_data: CreateGenre):
-        new_genre = self.book_genre_repository.add(create_data.model_dump())
+    async def create_genre(self, create_data: CreateGenre):
+        new_genre = await self.book_genre_repository.add(create_data.model_dump())
         if not new_genre:
             return Status.FAILED.value
+        response_cache.bump('genres')
         return new_genre
     
-    def update_genre(self, id: int, data: UpdateGenre):
+    async def update_genre(self, id: int, data: UpdateGenre):
         entity = data.model_dump()
         entity['id'] = id
         entity = {k: v for k, v in entity.items() if v is not None}
-        upd_genre = self.book_genre_repository.update(entity)
+        async with self.book_genre_repository.transaction():
+            upd_genre = await self.book_genre_repository.update(entity)
+            await self.book_card_repository.refresh(await self.book_card_repository.get_book_ids(id_genre=id))
+        response_cache.bump('genres')
         return upd_genre
     
-    def delete_genre(self, id: int):
-        self.book_genre_assoc_repository.session.query(GenreBook).filter_by(id_genre=id).delete()
-        return self.book_genre_repository.delete(id)
-    
-    
\ No newline at end of file
+    async def delete_genre(self, id: int):
+        async with self.book_genre_repository.transaction():
+            ids_book = await self.book_card_repository.get_book_ids(id_genre=id)
+            await self.book_genre_assoc_repository.delete_by_filter(id_genre=id)
+            result = await self.book_genre_repository.delete(id)
+            await self.book_card_repository.refresh(ids_book)
+        response_cache.bump('genres')
+        return result
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator
+from config.database import EXPORT_BATCH_SIZE
+from crud.exports import ExportRepository
+from models.orders import Order
+from utils.enums import ExportEntity, ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: 'text/csv; charset=utf-8',
+    ExportFormat.NDJSON: 'application/x-ndjson',
+}
+
+
+class ExportService:
+    # Генератор выполняется после выхода из зависимостей запроса, поэтому открывает свою сессию
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    def export(self, entity: ExportEntity, export_format: ExportFormat, date_from: date = None,
+               date_to: date = None, status: str = None) -> Iterator[bytes]:
+        with self.session_factory() as session:
+            repository = ExportRepository(model=Order, session=session)
+            if entity == ExportEntity.ORDERS:
+                query = repository.orders_query(date_from, date_to, status)
+            elif entity == ExportEntity.BOOKS:
+                query = repository.books_query()
+            else:
+                query = repository.users_query()
+            columns = [column.key for column in query.selected_columns]
+
+            if export_format == ExportFormat.CSV:
+                # BOM, чтобы Excel открыл UTF-8 без вопросов; заголовок уходит сразу
+                yield self.csv_chunk([columns], prefix='\ufeff')
+            for rows in repository.stream(query, EXPORT_BATCH_SIZE):
+                if export_format == ExportFormat.CSV:
+                    yield self.csv_chunk(rows)
+                else:
+                    yield self.ndjson_chunk(columns, rows)
+
+    def csv_chunk(self, rows, prefix: str = '') -> bytes:
+        buffer = io.StringIO()
+        buffer.write(prefix)
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def ndjson_chunk(self, columns: list[str], rows) -> bytes:
+        return ''.join(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + '\n' for row in rows).encode()
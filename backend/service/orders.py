@@ -1,29 +1,69 @@
-from utils.abstract_repository import IREpository
+from datetime import date
+from fastapi import HTTPException
+from utils.abstract_repository import AsyncIREpository
 from models.orders import Order
-from dependencies import OrderRepository
-from schemas.orders import CreateOrder, UpdateOrder
-from utils.enums import Status
+from schemas.orders import CreateOrder, UpdateOrder, Order as OrderSchema
+from utils.enums import Status, OrderStatus, OrderTransition, ListView
+from utils.pagination import Pagination
+
+# Статусы, в которых экземпляр книги находится не в библиотеке
+HOLDS_COPY = {OrderStatus.CHECKED_OUT.value, OrderStatus.LOST.value}
+
+TRANSITION_ERRORS = {
+    OrderTransition.NOT_FOUND: (404, Status.NOT_FOUND, 'Order not found'),
+    OrderTransition.SAME_STATUS: (409, Status.CONFLICT, 'Order already has this status'),
+    OrderTransition.STATUS_CHANGED: (409, Status.CONFLICT, 'Order status was changed by another request'),
+    OrderTransition.OUT_OF_STOCK: (409, Status.CONFLICT, 'zero count of books'),
+}
+
+
+def stock_delta(old_status: str, new_status: str) -> int:
+    # Остаток меняется только при выдаче экземпляра или его возвращении в библиотеку
+    return (old_status in HOLDS_COPY) - (new_status in HOLDS_COPY)
+
 
 class OrderService:
-    def __init__(self, order_repository: OrderRepository):
+    def __init__(self, order_repository: AsyncIREpository):
         self.order_repository = order_repository
 
-    def get_all_orders_filter_by(self, **filter):
-        return self.order_repository.get_all_filter_by(**filter)
+    async def get_all_orders_filter_by(self, **filter):
+        return await self.order_repository.get_all_filter_by(**filter)
     
-    def get_one_order_filter_by(self, **filter):
-        return self.order_repository.get_one_filter_by(**filter)
+    async def get_one_order_filter_by(self, **filter):
+        return await self.order_repository.get_one_filter_by(**filter)
 
-    def create_order(self, order_data: dict):
-        order = self.order_repository.add(order_data)
+    # Заказы отдаются ORM-объектами с загруженными user и book, в JSON их переводит роутер
+    async def get_all_orders_details_filter_by(self, pagination: Pagination = None, view: ListView = ListView.FULL, **filter):
+        return await self.order_repository.get_all_orders_details_filter_by(pagination, view=view, **filter)
+
+    async def get_one_order_details(self, id: int):
+        order = await self.order_repository.get_one_order_details(id)
+        if not order:
+            return None
+        return OrderSchema.model_validate(order)
+
+    async def create_order(self, order_data: dict):
+        order = await self.order_repository.add(order_data)
         return order
     
-    def update_order(self, id: int, upd_data: UpdateOrder):
+    async def update_order(self, id: int, upd_data: UpdateOrder):
         entity = upd_data.model_dump()
         entity['id'] = id
         entity = {k: v for k, v in entity.items() if v is not None}
-        return self.order_repository.update(entity)
-    
-    def delete_order(self, id: int):
-        return self.order_repository.delete(id=id)
+        if 'status' not in entity:
+            return await self.order_repository.update(entity)
 
+        if entity['status'] == OrderStatus.CHECKED_OUT.value:
+            entity['checkout_date'] = date.today()
+        elif entity['status'] == OrderStatus.RETURNED.value:
+            entity['return_date'] = date.today()
+        # Статус заказа и остаток книги меняются в одной транзакции
+        async with self.order_repository.transaction():
+            result = await self.order_repository.change_status(id, entity, stock_delta)
+            if result != OrderTransition.APPLIED:
+                status_code, status, message = TRANSITION_ERRORS[result]
+                raise HTTPException(status_code=status_code, detail={'status': status.value, 'message': message})
+        return entity
+    
+    async def delete_order(self, id: int):
+        return await self.order_repository.delete(id=id)
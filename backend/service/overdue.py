@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import date, datetime
+from starlette.concurrency import run_in_threadpool
+from config.jobs import OVERDUE_SCAN_BATCH_SIZE, OVERDUE_SCAN_DELAY, OVERDUE_SCAN_INTERVAL
+from crud.overdue import OverdueRepository, acquire_scan_lock, release_scan_lock
+from models.orders import OverdueOrder
+from utils.abstract_repository import AsyncIREpository
+from utils.pagination import Pagination
+
+logger = logging.getLogger(__name__)
+
+
+class ScanStats:
+    # Длительность и результат проходов сканера, отдаются в /api/admin/overdue
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.last_started = None
+        self.last_duration = None
+        self.last_found = None
+        self.last_error = None
+
+    def record(self, started: datetime, seconds: float, found: int | None, error: str | None = None):
+        with self.lock:
+            self.runs += 1
+            self.duration_total += seconds
+            self.duration_max = max(self.duration_max, seconds)
+            self.last_started = started
+            self.last_duration = seconds
+            self.last_error = error
+            if error:
+                self.failures += 1
+            else:
+                self.last_found = found
+
+    def skip(self):
+        with self.lock:
+            self.skipped += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                'runs': self.runs,
+                'failures': self.failures,
+                'skipped': self.skipped,
+                'last_started': self.last_started,
+                'last_duration_ms': round(self.last_duration * 1000, 3) if self.last_duration is not None else None,
+                'avg_duration_ms': round(self.duration_total / self.runs * 1000, 3) if self.runs else 0.0,
+                'max_duration_ms': round(self.duration_max * 1000, 3),
+                'last_found': self.last_found,
+                'last_error': self.last_error,
+            }
+
+
+class OverdueScanner:
+    # Фоновая задача: работает вне запросов, поэтому открывает свою сессию
+    def __init__(self, engine, session_factory, batch_size: int = OVERDUE_SCAN_BATCH_SIZE,
+                 interval: float = OVERDUE_SCAN_INTERVAL, delay: float = OVERDUE_SCAN_DELAY):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.delay = delay
+        self.stats = ScanStats()
+        # Ручной запуск и плановый не должны идти одновременно
+        self.lock = asyncio.Lock()
+
+    def scan_sync(self, today: date, scanned_at: datetime) -> int | None:
+        # Между процессами проходы разделяет блокировка в БД; None - проход уже идёт в другом процессе
+        with self.engine.connect() as connection:
+            if not acquire_scan_lock(connection):
+                return None
+            try:
+                with self.session_factory(bind=connection) as session:
+                    return OverdueRepository(model=OverdueOrder, session=session).scan(today, scanned_at, self.batch_size)
+            finally:
+                release_scan_lock(connection)
+
+    async def scan(self) -> int | None:
+        async with self.lock:
+            started = datetime.now()
+            start = time.perf_counter()
+            try:
+                found = await run_in_threadpool(self.scan_sync, started.date(), started)
+            except Exception as e:
+                self.stats.record(started, time.perf_counter() - start, None, repr(e))
+                raise
+            seconds = time.perf_counter() - start
+            if found is None:
+                self.stats.skip()
+                logger.info('Overdue scan skipped: another process holds the lock')
+                return None
+            self.stats.record(started, seconds, found)
+            logger.info('Overdue scan: %d orders in %.3f s', found, seconds)
+            return found
+
+    async def run(self):
+        await asyncio.sleep(self.delay)
+        while True:
+            try:
+                await self.scan()
+            except Exception:
+                # Ошибка одного прохода не останавливает планировщик
+                logger.exception('Overdue scan failed')
+            await asyncio.sleep(self.interval)
+
+
+class OverdueService:
+    def __init__(self, overdue_repository: AsyncIREpository, scanner: OverdueScanner):
+        self.overdue_repository = overdue_repository
+        self.scanner = scanner
+
+    async def get_overdue(self, pagination: Pagination = None, **filter):
+        return await self.overdue_repository.get_all_filter_by(pagination, **filter)
+
+    def get_stats(self) -> dict:
+        return {
+            'batch_size': self.scanner.batch_size,
+            'interval_seconds': self.scanner.interval,
+            **self.scanner.stats.snapshot(),
+        }
+
+    async def scan(self) -> int | None:
+        return await self.scanner.scan()
@@ -1,31 +1,39 @@
-from utils.abstract_repository import IREpository
-from models.books import *
-from dependencies import PublisherRepository
+from utils.abstract_repository import AsyncIREpository
 from schemas.publishers import *
-from utils.enums import Status
+from utils.enums import Status, ListView
+from utils.pagination import Pagination
+from utils.response_cache import response_cache
 
 class PublisherService:
-    def __init__(self, publisher_repository: PublisherRepository):
+    def __init__(self, publisher_repository: AsyncIREpository,
+                 book_card_repository: AsyncIREpository):
         self.publisher_repository = publisher_repository
+        self.book_card_repository = book_card_repository
 
-    def get_all_publisher_filter_by(self, **filter):
-        return self.publisher_repository.get_all_filter_by(**filter)
+    async def get_all_publisher_filter_by(self, pagination: Pagination = None, view: ListView = ListView.FULL, **filter):
+        return await self.publisher_repository.get_all_publishers_filter_by(pagination, view=view, **filter)
     
-    def get_one_publisher_filter_by(self, **filter):
-        return self.publisher_repository.get_one_filter_by(**filter)
+    async def get_one_publisher_filter_by(self, **filter):
+        return await self.publisher_repository.get_one_filter_by(**filter)
 
-    def create_publisher(self, create_data: CreatePublisher):
-        new_publisher = self.publisher_repository.add(create_data.model_dump())
+    async def create_publisher(self, create_data: CreatePublisher):
+        new_publisher = await self.publisher_repository.add(create_data.model_dump())
         if not new_publisher:
             return Status.FAILED.value
+        response_cache.bump('publishers')
         return new_publisher
 
-    def update_publisher(self, id: int, data: UpdatePublisher):
+    async def update_publisher(self, id: int, data: UpdatePublisher):
         entity = data.model_dump()
         entity['id'] = id
         entity = {k: v for k, v in entity.items() if v is not None}
-        upd_publisher = self.publisher_repository.update(entity)
+        async with self.publisher_repository.transaction():
+            upd_publisher = await self.publisher_repository.update(entity)
+            await self.book_card_repository.refresh(await self.book_card_repository.get_book_ids(id_publisher=id))
+        response_cache.bump('publishers')
         return upd_publisher
     
-    def delete_publisher(self, id: int):
-        return self.publisher_repository.delete(id)
\ No newline at end of file
+    async def delete_publisher(self, id: int):
+        result = await self.publisher_repository.delete(id)
+        response_cache.bump('publishers')
+        return result
\ No newline at end of file
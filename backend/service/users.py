@@ -1,58 +1,77 @@
 from utils.enums import Roles, AuthStatus
 from fastapi import HTTPException
-from passlib.hash import pbkdf2_sha256
 from schemas.users import *
-from crud.users import UserRepository
+from utils.abstract_repository import AsyncIREpository
+from utils.pagination import Pagination
 from utils.enums import Status
+from service.auth import invalidate_user_cache
+from utils.passwords import hash_password, verify_password
+from utils.response_cache import response_cache
 
 class UserService:
-    def __init__(self, user_repository: UserRepository,
-                 school_class_repository: UserRepository):
+    def __init__(self, user_repository: AsyncIREpository,
+                 school_class_repository: AsyncIREpository):
         self.school_class_repository = school_class_repository
         self.user_repository = user_repository
 
-    def get_all_users_filter_by(self, **filter):
-        users = self.user_repository.get_all_filter_by(**filter)
+    async def get_all_users_filter_by(self, **filter):
+        users = await self.user_repository.get_all_filter_by(**filter)
         return users
 
-    def get_user_filter_by(self, **filter):
-        user = self.user_repository.get_one_filter_by(**filter)
+    async def get_user_filter_by(self, **filter):
+        user = await self.user_repository.get_one_filter_by(**filter)
         return user
 
-    def update(self, user_id: int, data: UserUpdate):
+    async def get_user_details(self, **filter):
+        return await self.user_repository.get_one_user_details(**filter)
+
+    async def get_all_users_details(self, pagination: Pagination = None, **filter):
+        return await self.user_repository.get_all_users_details(pagination, **filter)
+
+    async def update(self, user_id: int, data: UserUpdate):
         entity = data.model_dump()
-        user = self.user_repository.get_one_filter_by(id=user_id)
-        if data.password and not pbkdf2_sha256.verify(data.password, user.password):
+        user = await self.user_repository.get_one_filter_by(id=user_id)
+        if data.password and not await verify_password(data.password, user.password):
             raise HTTPException(status_code=403, detail={'status': AuthStatus.INVALID_PASSWORD.value})
         if data.password:
-            entity['password'] = pbkdf2_sha256.hash(data.password)
-        self.user_repository.update(user_id, entity)
-        updated_user = self.user_repository.get_one_filter_by(id=user_id)
+            entity['password'] = await hash_password(data.password)
+        entity['id'] = user_id
+        entity = {k: v for k, v in entity.items() if v is not None}
+        await self.user_repository.update(entity)
+        invalidate_user_cache(user_id)
+        # С классом: ответ сериализуется через UserResponse
+        updated_user = await self.user_repository.get_one_user_details(id=user_id)
         return updated_user
 
-    def delete_user(self, user_id: int):
-        return self.user_repository.delete(user_id)
+    async def delete_user(self, user_id: int):
+        result = await self.user_repository.delete(user_id)
+        invalidate_user_cache(user_id)
+        return result
     
 
     #School Classes
-    def get_all_school_classes_filter_by(self, **filter):
-        return self.school_class_repository.get_all_filter_by(**filter)
+    async def get_all_school_classes_filter_by(self, **filter):
+        return await self.school_class_repository.get_all_filter_by(**filter)
     
-    def get_one_school_class_filter_by(self, **filter):
-        return self.school_class_repository.get_one_filter_by(**filter)
+    async def get_one_school_class_filter_by(self, **filter):
+        return await self.school_class_repository.get_one_filter_by(**filter)
     
-    def create_school_class(self, create_data: CreateSchoolClass):
-        new_school_class = self.school_class_repository.add(create_data.model_dump())
+    async def create_school_class(self, create_data: CreateSchoolClass):
+        new_school_class = await self.school_class_repository.add(create_data.model_dump())
         if not new_school_class:
             return Status.FAILED.value
+        response_cache.bump('school_classes')
         return new_school_class
         
-    def update_school_class(self, id: int, data: UpdateSchoolClass):
+    async def update_school_class(self, id: int, data: UpdateSchoolClass):
         entity = data.model_dump()
         entity['id'] = id
         entity = {k: v for k, v in entity.items() if v is not None}
-        upd_school_class = self.school_class_repository.update(entity)
+        upd_school_class = await self.school_class_repository.update(entity)
+        response_cache.bump('school_classes')
         return upd_school_class
     
-    def delete_school_class(self, id: int):
-        return self.school_class_repository.delete(id)
\ No newline at end of file
+    async def delete_school_class(self, id: int):
+        result = await self.school_class_repository.delete(id)
+        response_cache.bump('school_classes')
+        return result
\ No newline at end of file
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import pytest
+
+# Конфигурация читается при импорте модулей, поэтому окружение задаётся до них:
+# временная SQLite-база вместо MySQL из .env
+_db_path = os.path.join(tempfile.mkdtemp(), 'test.db')
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{_db_path}')
+os.environ.setdefault('ASYNC_DATABASE_URL', f'sqlite+aiosqlite:///{_db_path}')
+os.environ.setdefault('DB_ASYNC', 'false')
+os.environ.setdefault('SECRET_KEY', 'test-secret-key-test-secret-key-test')
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from config.database import Base
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "db.sqlite"}', connect_args={'timeout': 30})
+
+    # SQLite: транзакция сразу берёт блокировку записи (BEGIN IMMEDIATE), как SELECT ... FOR UPDATE,
+    # иначе параллельные транзакции получают "database is locked" при переходе к записи
+    @event.listens_for(engine, 'connect')
+    def connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def begin(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    engine.dispose()
@@ -0,0 +1,68 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import pytest
+from crud.orders import OrderRepository
+from models import Book, Order, Publisher, User
+from service.orders import stock_delta
+from utils.enums import OrderStatus, OrderTransition
+
+BOOK_ID = 1
+
+
+@pytest.fixture
+def library(session_factory):
+    def seed(copies: int, orders: int):
+        today = date.today()
+        with session_factory() as db:
+            db.add(Publisher(id=1, name='Publisher', description='', foundation_year=1900))
+            db.add(User(id=1, name='Librarian', role='ADMIN', email='librarian@school.com', password='-'))
+            db.flush()
+            db.add(Book(id=BOOK_ID, name='Book', description='', id_publisher=1, year=2000, ISBN='1', count=copies))
+            db.flush()
+            db.add_all([Order(id=i, id_user=1, id_book=BOOK_ID, order_date=today, due_date=today + timedelta(days=14),
+                              status=OrderStatus.PROCESSING.value) for i in range(1, orders + 1)])
+            db.commit()
+    return seed
+
+
+def change_status(session_factory, id: int, status: OrderStatus) -> OrderTransition:
+    # Как OrderService.update_order: неудачный переход откатывается вместе с сессией
+    with session_factory() as db:
+        return OrderRepository(Order, db).change_status(id, {'status': status.value}, stock_delta)
+
+
+def change_concurrently(session_factory, ids: list[int], status: OrderStatus) -> Counter:
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return Counter(pool.map(lambda id: change_status(session_factory, id, status), ids))
+
+
+def book_count(session_factory) -> int:
+    with session_factory() as db:
+        return db.get(Book, BOOK_ID).count
+
+
+def test_concurrent_checkouts_never_oversell(session_factory, library):
+    library(copies=3, orders=20)
+    results = change_concurrently(session_factory, list(range(1, 21)), OrderStatus.CHECKED_OUT)
+    assert results == {OrderTransition.APPLIED: 3, OrderTransition.OUT_OF_STOCK: 17}
+    assert book_count(session_factory) == 0
+    with session_factory() as db:
+        assert db.query(Order).filter(Order.status == OrderStatus.CHECKED_OUT.value).count() == 3
+
+
+def test_duplicate_return_is_applied_once(session_factory, library):
+    library(copies=1, orders=1)
+    assert change_status(session_factory, 1, OrderStatus.CHECKED_OUT) == OrderTransition.APPLIED
+    assert book_count(session_factory) == 0
+    results = change_concurrently(session_factory, [1] * 8, OrderStatus.RETURNED)
+    assert results[OrderTransition.APPLIED] == 1
+    assert results[OrderTransition.SAME_STATUS] + results[OrderTransition.STATUS_CHANGED] == 7
+    assert book_count(session_factory) == 1
+
+
+def test_same_status_transition_is_rejected(session_factory, library):
+    library(copies=2, orders=1)
+    assert change_status(session_factory, 1, OrderStatus.CHECKED_OUT) == OrderTransition.APPLIED
+    assert change_status(session_factory, 1, OrderStatus.CHECKED_OUT) == OrderTransition.SAME_STATUS
+    assert book_count(session_factory) == 1
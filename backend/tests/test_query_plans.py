@@ -0,0 +1,143 @@
+"""
+Проверка планов запросов: горячие запросы репозиториев выполняются на заполненной базе,
+каждый из них прогоняется через EXPLAIN, и тест падает, если какой-то читает таблицу целиком.
+
+На SQLite (по умолчанию) полный просмотр - строка "SCAN <таблица>" без индекса в EXPLAIN QUERY PLAN,
+на MySQL (DATABASE_URL) - type = ALL в EXPLAIN. Таблицы заполняются заново.
+Отчёт с планами - `python -m benchmarks.explain`.
+"""
+import re
+from datetime import date, timedelta
+import pytest
+
+BOOKS = 500
+
+
+def seed(books: int):
+    from sqlalchemy import insert
+    from config.database import Base, engine, SessionLocal
+    from models import Author, AuthorBook, Book, Genre, GenreBook, Order, Publisher, SchoolClass, User
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    users = max(books // 4, 10)
+    today = date.today()
+    statuses = ['PROCESSING', 'CHECKED_OUT', 'RETURNED', 'CANCELLED']
+    with SessionLocal() as db:
+        db.execute(insert(SchoolClass), [{'id': i, 'name': f'{i}A'} for i in range(1, 21)])
+        db.execute(insert(Publisher), [{'id': i, 'name': f'Publisher {i}', 'description': ''} for i in range(1, 101)])
+        db.execute(insert(Author), [{'id': i, 'name': f'Author {i}', 'bio': ''} for i in range(1, books // 2 + 2)])
+        db.execute(insert(Genre), [{'id': i, 'name': f'Genre {i}'} for i in range(1, 51)])
+        db.execute(insert(User), [{'id': i, 'name': f'User {i}', 'email': f'user{i}@school.com', 'password': '-',
+                                   'role': 'USER', 'id_school_class': i % 20 + 1} for i in range(1, users + 1)])
+        db.execute(insert(Book), [{'id': i, 'name': f'Book {i}', 'description': '', 'id_publisher': i % 100 + 1,
+                                   'year': 2000, 'ISBN': f'978-{i:09}', 'count': 3} for i in range(1, books + 1)])
+        db.execute(insert(AuthorBook), [{'id_author': i // 2 + 1, 'id_book': i} for i in range(1, books + 1)])
+        db.execute(insert(GenreBook), [{'id_genre': i % 50 + 1, 'id_book': i} for i in range(1, books + 1)])
+        db.execute(insert(Order), [{
+            'id': i, 'id_user': i % users + 1, 'id_book': i % books + 1,
+            'order_date': today - timedelta(days=i % 365), 'due_date': today - timedelta(days=i % 365 - 14),
+            'status': statuses[i % len(statuses)],
+        } for i in range(1, books * 10 + 1)])
+        db.commit()
+    # Статистика для планировщика, как на живой базе
+    with engine.begin() as conn:
+        conn.exec_driver_sql('ANALYZE' if engine.dialect.name == 'sqlite' else
+                             'ANALYZE TABLE orders, users, books, author_books, genre_books, authors, genres, publishers')
+
+
+def scenarios(books: int) -> dict:
+    # Горячие запросы: вход, заказы пользователя, связи книги, каталог по фильтрам, фоновые задачи
+    from crud import AnalyticsRepository, AuthorRepository, BookCardRepository, BookRepository, \
+        OrderRepository, OverdueRepository, UserRepository
+    from models import Author, Book, BookCard, Genre, Order, OverdueOrder, Publisher, User
+    from utils.enums import OrderStatus
+    from utils.pagination import Pagination
+
+    book_id = books // 2
+    today = date.today()
+    return {
+        'login by email': lambda db: UserRepository(User, db).get_one_filter_by(email='user7@school.com'),
+        'user orders': lambda db: OrderRepository(Order, db).get_all_orders_details_filter_by(Pagination(limit=20), id_user=7),
+        'user orders by status': lambda db: OrderRepository(Order, db).get_all_orders_details_filter_by(
+            Pagination(limit=20), id_user=7, status=OrderStatus.CHECKED_OUT.value),
+        'book orders by status': lambda db: OrderRepository(Order, db).get_all_filter_by(
+            id_book=book_id, status=OrderStatus.CHECKED_OUT.value),
+        'order details': lambda db: OrderRepository(Order, db).get_one_order_details(book_id),
+        'order status change': lambda db: OrderRepository(Order, db).change_status(
+            1, {'status': OrderStatus.CANCELLED.value}, lambda old, new: 0),
+        'book by ISBN': lambda db: BookRepository(Book, db).get_all_books_filter_by(ISBN=f'978-{book_id:09}'),
+        'catalog by author': lambda db: BookRepository(Book, db).get_catalog_filter_by(Pagination(limit=20), id_author=3),
+        'catalog by genre': lambda db: BookRepository(Book, db).get_catalog_filter_by(Pagination(limit=20), id_genre=3),
+        'catalog sorted by name': lambda db: BookRepository(Book, db).get_catalog_filter_by(Pagination(limit=20, sort='name')),
+        'catalog by publisher': lambda db: BookRepository(Book, db).get_catalog_filter_by(Pagination(limit=20), id_publisher=3),
+        'authors of book': lambda db: AuthorRepository(Author, db).get_all_authors_filter_by(id_book=book_id),
+        'genres of book': lambda db: BookRepository(Genre, db).get_all_genres_filter_by(id_book=book_id),
+        'book card': lambda db: BookCardRepository(BookCard, db).get_document(book_id),
+        'books of publisher': lambda db: BookCardRepository(BookCard, db).get_book_ids(id_publisher=3),
+        'books of author': lambda db: BookCardRepository(BookCard, db).get_book_ids(id_author=3),
+        'import name lookup': lambda db: BookRepository(Book, db).resolve_names(
+            Publisher, {'Publisher 3', 'Publisher 4'}, {}, {'publishers': 0}),
+        'overdue scan batch': lambda db: OverdueRepository(OverdueOrder, db).get_overdue_batch(today, 500),
+        'analytics by month (window)': lambda db: AnalyticsRepository(Order, db).by_month(
+            today, today - timedelta(days=30), today),
+    }
+
+
+def capture(engine, name: str, run, db) -> list:
+    from sqlalchemy import event
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and re.match(r'\s*(SELECT|UPDATE|DELETE)', statement, re.I):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        run(db)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+        # Сценарии с записью не оставляют следов
+        db.rollback()
+    return statements
+
+
+def full_scans(conn, dialect: str, statement: str, parameters) -> tuple[list, list]:
+    if dialect == 'sqlite':
+        plan = [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()]
+        # "SCAN books" - полный просмотр; "SCAN books USING INDEX ..." - обход индекса
+        scans = [line.split()[1] for line in plan
+                 if line.startswith('SCAN ') and ' USING ' not in line and 'CONSTANT ROW' not in line]
+        return plan, scans
+    result = conn.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings().all()
+    plan = [{key: row[key] for key in ('table', 'type', 'key', 'rows')} for row in result]
+    return plan, [row['table'] for row in result if row['type'] == 'ALL']
+
+
+def check(books: int) -> dict:
+    from config.database import engine, SessionLocal
+
+    report = {}
+    with SessionLocal() as db:
+        for name, run in scenarios(books).items():
+            statements = capture(engine, name, run, db)
+            entries = []
+            with engine.connect() as conn:
+                for statement, parameters in statements:
+                    plan, scans = full_scans(conn, engine.dialect.name, statement, parameters)
+                    entries.append({'sql': ' '.join(statement.split()), 'plan': plan, 'full_scans': scans})
+            report[name] = entries
+    return report
+
+
+
+@pytest.fixture(scope='module')
+def plans() -> dict:
+    seed(BOOKS)
+    return check(BOOKS)
+
+
+@pytest.mark.parametrize('name', list(scenarios(BOOKS)))
+def test_no_full_scans(plans, name):
+    failures = [entry for entry in plans[name] if entry['full_scans']]
+    assert not failures, failures
@@ -1,5 +1,14 @@
 from abc import ABC, abstractmethod
-from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, Query, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from utils.pagination import Pagination, encode_cursor, decode_cursor, invalid_pagination
+
+# Глубина вложенности transaction() хранится в session.info, поэтому общая для всех
+# репозиториев одной сессии
+TRANSACTION_DEPTH = 'transaction_depth'
 
 class AbstractRepository(ABC):
     @abstractmethod
@@ -31,28 +40,152 @@ class IREpository(AbstractRepository):
         self.model = model
         self.session = session
 
-    def get_all_filter_by(self, **filter):
-        return self.session.query(self.model).filter_by(**filter).all()
+    def get_all_filter_by(self, pagination: Pagination | None = None, **filter):
+        query = self.session.query(self.model).filter_by(**filter)
+        if pagination:
+            return self.paginate(query, pagination)
+        return query.all()
 
     def get_one_filter_by(self, **filter):
         return self.session.query(self.model).filter_by(**filter).first()
 
+    def load_columns(self, query: Query, columns: list, pagination: Pagination | None = None) -> Query:
+        # Короткие списки читают только нужные колонки; колонка сортировки нужна для курсора
+        if pagination and pagination.sort_field in self.model.__table__.columns:
+            columns = [*columns, getattr(self.model, pagination.sort_field)]
+        return query.options(load_only(*columns))
+
+    def in_transaction(self) -> bool:
+        return self.session.info.get(TRANSACTION_DEPTH, 0) > 0
+
+    def commit(self):
+        # Внутри transaction() изменения только отправляются в БД, коммит - при выходе из блока
+        if self.in_transaction():
+            self.session.flush()
+        else:
+            self.session.commit()
+
     def add(self, entity: dict):
         entity = self.model(**entity)
         self.session.add(entity)
-        self.session.commit()
+        self.commit()
         return entity
 
+    def add_all(self, entities: list[dict]):
+        # Один flush на все строки: ORM отправит их одним executemany
+        entities = [self.model(**entity) for entity in entities]
+        self.session.add_all(entities)
+        self.commit()
+        return entities
+
     def update(self, entity: dict):
         self.session.query(self.model).filter_by(id=entity['id']).update(entity)
-        self.session.commit()
+        self.commit()
         return entity
 
     def delete(self, id: int):
         self.session.query(self.model).filter_by(id=id).delete()
-        self.session.commit()
+        self.commit()
 
     def delete_by_filter(self, **filter):
         result = self.session.query(self.model).filter_by(**filter).delete()
-        self.session.commit()
+        self.commit()
         return result > 0
+
+    def paginate(self, query: Query, pagination: Pagination):
+        # Keyset-пагинация по (колонка сортировки, id) без OFFSET
+        field = pagination.sort_field
+        column = self.model.__table__.columns.get(field)
+        if column is None or column.nullable:
+            raise invalid_pagination(f'Cannot sort by {field}')
+        sort_column = getattr(self.model, field)
+        key = self.model.id
+
+        if pagination.cursor:
+            value, last_id = decode_cursor(pagination.cursor, pagination.sort, column.type.python_type)
+            if field == 'id':
+                condition = key < last_id if pagination.descending else key > last_id
+            elif pagination.descending:
+                condition = or_(sort_column < value, and_(sort_column == value, key < last_id))
+            else:
+                condition = or_(sort_column > value, and_(sort_column == value, key > last_id))
+            query = query.filter(condition)
+
+        order = [sort_column] if field == 'id' else [sort_column, key]
+        if pagination.descending:
+            order = [item.desc() for item in order]
+        items = query.order_by(*order).limit(pagination.limit + 1).all()
+
+        pagination.next_cursor = None
+        if len(items) > pagination.limit:
+            items = items[:pagination.limit]
+            last = items[-1]
+            pagination.next_cursor = encode_cursor(pagination.sort, getattr(last, field), last.id)
+        return items
+
+
+class AsyncIREpository(AbstractRepository):
+    # Асинхронная обёртка над IREpository. С AsyncSession запросы идут через асинхронный
+    # драйвер (run_sync), с обычной Session - в пуле потоков, так что event loop не блокируется.
+    # Методы конкретного репозитория (например, BookRepository.get_catalog_filter_by)
+    # доступны так же, как корутины.
+    def __init__(self, model, session: AsyncSession | Session, repository_class: type[IREpository] = IREpository):
+        self.model = model
+        self.session = session
+        sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+        self.repository = repository_class(model=model, session=sync_session)
+
+    async def run(self, method, *args, **kwargs):
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(lambda _: method(*args, **kwargs))
+        return await run_in_threadpool(method, *args, **kwargs)
+
+    async def get_all_filter_by(self, pagination: Pagination | None = None, **filter):
+        return await self.run(self.repository.get_all_filter_by, pagination, **filter)
+
+    async def get_one_filter_by(self, **filter):
+        return await self.run(self.repository.get_one_filter_by, **filter)
+
+    @asynccontextmanager
+    async def transaction(self):
+        # Unit of work: операции всех репозиториев этой сессии внутри блока фиксируются
+        # одним коммитом, а при исключении откатываются. Вложенные блоки входят во внешний.
+        session = self.repository.session
+        depth = session.info.get(TRANSACTION_DEPTH, 0)
+        session.info[TRANSACTION_DEPTH] = depth + 1
+        try:
+            yield self
+        except BaseException:
+            session.info[TRANSACTION_DEPTH] = depth
+            if depth == 0:
+                await self.run(session.rollback)
+            raise
+        session.info[TRANSACTION_DEPTH] = depth
+        if depth == 0:
+            await self.run(session.commit)
+
+    async def add(self, entity: dict):
+        return await self.run(self.repository.add, entity)
+
+    async def add_all(self, entities: list[dict]):
+        return await self.run(self.repository.add_all, entities)
+
+    async def update(self, entity: dict):
+        return await self.run(self.repository.update, entity)
+
+    async def delete(self, id: int):
+        return await self.run(self.repository.delete, id)
+
+    async def delete_by_filter(self, **filter):
+        return await self.run(self.repository.delete_by_filter, **filter)
+
+    def __getattr__(self, name):
+        if name == 'repository':
+            raise AttributeError(name)
+        method = getattr(self.repository, name)
+        if not callable(method):
+            return method
+
+        async def wrapper(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+        return wrapper
@@ -0,0 +1,127 @@
+import gzip
+import zlib
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from config.compression import COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL, \
+    COMPRESSION_BROTLI_QUALITY
+
+# При равном q предпочитаем brotli: на JSON он заметно плотнее gzip
+ENCODINGS = ('br', 'gzip')
+# Сжимаем только текстовые типы: картинки (JPEG, PNG, WebP) уже сжаты, повторное сжатие
+# лишь тратит CPU
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/x-ndjson', 'application/xml',
+                      'application/javascript', 'image/svg+xml')
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    # Accept-Encoding: br;q=1.0, gzip;q=0.8, *;q=0.1
+    weights = {}
+    for item in accept_encoding.lower().split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def request_encoding(headers: Headers) -> str | None:
+    if not COMPRESSION_ENABLED:
+        return None
+    return negotiate(headers.get('accept-encoding', ''))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 - одинаковый результат для одинакового тела
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compressible(status: int, headers: MutableHeaders) -> bool:
+    if status < 200 or status in (204, 304) or 'content-encoding' in headers:
+        return False
+    return headers.get('content-type', '').startswith(COMPRESSIBLE_TYPES)
+
+
+class StreamCompressor:
+    # Потоковое сжатие для ответов из нескольких частей (выгрузки): каждая часть
+    # сбрасывается сразу, чтобы клиент получал данные по мере генерации
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self.compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self.compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes, last: bool) -> bytes:
+        if self.encoding == 'br':
+            data = self.compressor.process(chunk)
+            return data + (self.compressor.finish() if last else self.compressor.flush())
+        data = self.compressor.compress(chunk)
+        return data + self.compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    # Чистый ASGI: заголовки ответа придерживаются до первой части тела, по ней решается,
+    # сжимать ли ответ. Ответы с готовым Content-Encoding (кэш ответов) проходят как есть
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        encoding = negotiate(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                return await send(message)
+            if message['type'] == 'http.response.start':
+                start = message
+                return
+            if message['type'] != 'http.response.body':
+                return await send(message)
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start['headers'])
+                if not compressible(start['status'], headers) or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start)
+                    return await send(message)
+                headers['Content-Encoding'] = encoding
+                headers.add_vary_header('Accept-Encoding')
+                # Тело меняется, поэтому строгий ETag становится слабым
+                etag = headers.get('etag')
+                if etag and not etag.startswith('W/'):
+                    headers['ETag'] = 'W/' + etag
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers['Content-Length'] = str(len(body))
+                    await send(start)
+                    return await send({'type': 'http.response.body', 'body': body})
+                if 'content-length' in headers:
+                    del headers['Content-Length']
+                compressor = StreamCompressor(encoding)
+                await send(start)
+            await send({'type': 'http.response.body', 'body': compressor.compress(body, not more_body),
+                        'more_body': more_body})
+
+        await self.app(scope, receive, send_wrapper)
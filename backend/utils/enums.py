@@ -5,6 +5,7 @@ class Status(Enum):
     FAILED = 'FAILED'
     NOT_FOUND = 'NOT_FOUND'
     UNAUTHORIZED = 'UNAUTHORIZED'
+    CONFLICT = 'CONFLICT'
 
 class AuthStatus(Enum):
     SUCCESS = 'SUCCESS'
@@ -34,3 +35,35 @@ class OrderStatus(Enum):
     CANCELLED = 'CANCELLED'
     LOST = 'LOST'
 
+class OrderTransition(Enum):
+    APPLIED = 'APPLIED'
+    NOT_FOUND = 'NOT_FOUND'
+    SAME_STATUS = 'SAME_STATUS'
+    STATUS_CHANGED = 'STATUS_CHANGED'
+    OUT_OF_STOCK = 'OUT_OF_STOCK'
+
+class ImportFormat(Enum):
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+class ExportEntity(Enum):
+    ORDERS = 'orders'
+    BOOKS = 'books'
+    USERS = 'users'
+
+class ExportFormat(Enum):
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+class ImageSize(Enum):
+    THUMBNAIL = 'thumbnail'
+    CARD = 'card'
+    FULL = 'full'
+
+class ImageFormat(Enum):
+    WEBP = 'webp'
+    JPEG = 'jpeg'
+
+class ListView(Enum):
+    SUMMARY = 'summary'
+    FULL = 'full'
@@ -1,15 +1,149 @@
+import aiofiles
+import aiofiles.os
+import hashlib
 import os
-from fastapi import UploadFile
+import threading
+import uuid
+from fastapi import HTTPException, UploadFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+from config.images import IMAGE_MAX_UPLOAD_BYTES, IMAGE_UPLOAD_CHUNK_SIZE
+from utils.enums import ImageSize, ImageFormat, Status
 
+IMAGES_DIR = 'images'
+VARIANTS_DIR = os.path.join(IMAGES_DIR, 'variants')
 
-def save_image(image: UploadFile) -> str:
-    save_path = f"images"
-    if not os.path.exists(save_path):
-        os.makedirs(save_path)
+# Максимальная сторона варианта в пикселях
+IMAGE_SIZES = {
+    ImageSize.THUMBNAIL: 200,
+    ImageSize.CARD: 480,
+    ImageSize.FULL: 1200,
+}
+IMAGE_QUALITY = {
+    ImageFormat.WEBP: 80,
+    ImageFormat.JPEG: 82,
+}
+MEDIA_TYPES = {
+    ImageFormat.WEBP: 'image/webp',
+    ImageFormat.JPEG: 'image/jpeg',
+}
+# Генерация варианта по запросу: блокировка по хешу пути, чтобы одновременные запросы
+# одной картинки не запускали Pillow каждый. Число блокировок фиксировано
+VARIANT_LOCKS = [threading.Lock() for _ in range(64)]
+# Битый файл, неизвестный формат или слишком большие размеры (защита Pillow от decompression bomb)
+IMAGE_ERRORS = (UnidentifiedImageError, Image.DecompressionBombError, OSError)
 
-    image_path = os.path.join(save_path, image.filename)
-    
-    with open(image_path, "wb") as f:
-        f.write(image.file.read())
-    
-    return image.filename
\ No newline at end of file
+
+def image_path(image_name: str) -> str:
+    return os.path.join(IMAGES_DIR, os.path.basename(image_name))
+
+
+def variant_path(image_name: str, size: ImageSize, image_format: ImageFormat) -> str:
+    # Имя с расширением: у a.png и a.jpg разные варианты
+    return os.path.join(VARIANTS_DIR, f'{os.path.basename(image_name)}.{size.value}.{image_format.value}')
+
+
+def save_variant(image: Image.Image, path: str, image_format: ImageFormat):
+    if image_format == ImageFormat.JPEG and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+        image = background
+    # Пишем во временный файл с уникальным именем и переименовываем, чтобы не отдать
+    # недописанный вариант и не мешать другим процессам, пишущим тот же вариант
+    tmp_path = os.path.join(VARIANTS_DIR, f'.{uuid.uuid4().hex}.tmp')
+    try:
+        image.save(tmp_path, format=image_format.name, quality=IMAGE_QUALITY[image_format], optimize=True)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def make_variants(image_name: str, sizes=tuple(ImageSize), formats=tuple(ImageFormat), source: str | None = None):
+    os.makedirs(VARIANTS_DIR, exist_ok=True)
+    with Image.open(source or image_path(image_name)) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA' if 'transparency' in original.info else 'RGB')
+        for size in sizes:
+            variant = original.copy()
+            variant.thumbnail((IMAGE_SIZES[size], IMAGE_SIZES[size]), Image.Resampling.LANCZOS)
+            for image_format in formats:
+                save_variant(variant, variant_path(image_name, size, image_format), image_format)
+
+
+def ensure_variant(image_name: str, size: ImageSize, image_format: ImageFormat) -> str | None:
+    path = variant_path(image_name, size, image_format)
+    with VARIANT_LOCKS[hash(path) % len(VARIANT_LOCKS)]:
+        # Пока ждали блокировку, вариант мог создать другой запрос
+        if not os.path.exists(path):
+            if not os.path.exists(image_path(image_name)):
+                return None
+            try:
+                make_variants(image_name, (size,), (image_format,))
+            except IMAGE_ERRORS:
+                raise upload_error(415, 'Image cannot be processed')
+    return path
+
+
+async def get_variant(image_name: str, size: ImageSize, image_format: ImageFormat) -> str | None:
+    # Для картинок, загруженных до появления вариантов, вариант создаётся при первом запросе
+    path = variant_path(image_name, size, image_format)
+    if os.path.exists(path):
+        return path
+    return await run_in_threadpool(ensure_variant, image_name, size, image_format)
+
+
+def sniff_extension(head: bytes) -> str | None:
+    # Определяем тип по сигнатуре файла, а не по имени и Content-Type клиента
+    if head.startswith(b'\xff\xd8\xff'):
+        return '.jpg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return '.png'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return '.gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    return None
+
+
+def upload_error(status_code: int, message: str):
+    return HTTPException(status_code=status_code, detail={'status': Status.FAILED.value, 'message': message})
+
+
+async def save_image(image: UploadFile) -> str:
+    if image.size is not None and image.size > IMAGE_MAX_UPLOAD_BYTES:
+        raise upload_error(413, f'Image is larger than {IMAGE_MAX_UPLOAD_BYTES} bytes')
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    # Пишем по блокам во временный файл и переименовываем только после проверки
+    tmp_path = os.path.join(IMAGES_DIR, f'.upload-{uuid.uuid4().hex}.tmp')
+    digest = hashlib.sha256()
+    size = 0
+    extension = None
+    try:
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            while chunk := await image.read(IMAGE_UPLOAD_CHUNK_SIZE):
+                if extension is None:
+                    extension = sniff_extension(chunk)
+                    if extension is None:
+                        raise upload_error(415, 'Unsupported image type')
+                size += len(chunk)
+                if size > IMAGE_MAX_UPLOAD_BYTES:
+                    raise upload_error(413, f'Image is larger than {IMAGE_MAX_UPLOAD_BYTES} bytes')
+                digest.update(chunk)
+                await f.write(chunk)
+        if extension is None:
+            raise upload_error(400, 'Empty file')
+        # Имя файла - хеш содержимого: одинаковые картинки не дублируются, а кэш клиента не устаревает
+        image_name = digest.hexdigest()[:32] + extension
+        try:
+            await run_in_threadpool(make_variants, image_name, source=tmp_path)
+        except Image.DecompressionBombError:
+            raise upload_error(400, 'Image dimensions are too large')
+        except IMAGE_ERRORS:
+            raise upload_error(400, 'File is not an image')
+        await aiofiles.os.replace(tmp_path, image_path(image_name))
+    finally:
+        if await aiofiles.os.path.exists(tmp_path):
+            await aiofiles.os.remove(tmp_path)
+    return image_name
@@ -0,0 +1,135 @@
+import mimetypes
+import os
+import re
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from config.images import (IMAGE_MAX_AGE, IMMUTABLE_MAX_AGE, IMAGE_CACHE_SIZE, IMAGE_CACHE_TTL,
+                           IMAGE_CACHE_MAX_ITEM_BYTES, IMAGE_REVALIDATE_INTERVAL)
+from utils.cache import TTLCache
+
+CONTENT_ADDRESSED = re.compile(r'^[0-9a-f]{32}(\.|$)')
+
+
+class ImageEntry:
+    def __init__(self, mtime_ns: int, size: int, etag: str, body: bytes | None):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.etag = etag
+        self.last_modified = formatdate(mtime_ns / 1e9, usegmt=True)
+        # Содержимое храним только для небольших файлов, для больших - лишь ETag
+        self.body = body
+        self.checked_at = time.monotonic()
+
+
+image_cache = TTLCache(maxsize=IMAGE_CACHE_SIZE, ttl=IMAGE_CACHE_TTL)
+
+
+def load_entry(path: str, stat: os.stat_result) -> ImageEntry:
+    # ETag из времени изменения и размера: файл не нужно читать и хешировать. Большие файлы
+    # не читаются вовсе - их отдаёт FileResponse потоком
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    body = None
+    if stat.st_size <= IMAGE_CACHE_MAX_ITEM_BYTES:
+        with open(path, 'rb') as f:
+            body = f.read()
+    return ImageEntry(stat.st_mtime_ns, stat.st_size, etag, body)
+
+
+def revalidate(path: str, entry: ImageEntry | None) -> ImageEntry | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # Файл перезаписали - запись в кэше устарела
+    if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+        return load_entry(path, stat)
+    entry.checked_at = time.monotonic()
+    return entry
+
+
+async def get_entry(path: str) -> ImageEntry | None:
+    # Свежепроверенная запись отдаётся без обращения к диску; stat и чтение файла -
+    # в пуле потоков, чтобы не блокировать event loop
+    entry = image_cache.get(path)
+    if entry is not None and time.monotonic() - entry.checked_at < IMAGE_REVALIDATE_INTERVAL:
+        return entry
+    entry = await run_in_threadpool(revalidate, path, entry)
+    if entry is not None:
+        image_cache.set(path, entry)
+    return entry
+
+
+def cache_control(image_name: str) -> str:
+    if CONTENT_ADDRESSED.match(os.path.basename(image_name)):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={IMAGE_MAX_AGE}'
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == '*':
+        return True
+    return etag in [tag.strip().removeprefix('W/') for tag in header.split(',')]
+
+
+def not_modified(request: Request, entry: ImageEntry) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return etag_matches(if_none_match, entry.etag)
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(entry.mtime_ns // 1_000_000_000) <= since
+    return False
+
+
+def parse_range(request: Request, entry: ImageEntry) -> tuple[int, int] | None:
+    # Поддерживается один диапазон; несколько диапазонов или битый заголовок - отдаём файл целиком
+    header = request.headers.get('range', '')
+    if_range = request.headers.get('if-range')
+    if not header.startswith('bytes=') or ',' in header:
+        return None
+    if if_range is not None and if_range.strip() not in (entry.etag, entry.last_modified):
+        return None
+    start, _, end = header[6:].strip().partition('-')
+    try:
+        if start:
+            start, end = int(start), int(end) if end else entry.size - 1
+        else:
+            start, end = max(entry.size - int(end), 0), entry.size - 1
+    except ValueError:
+        return None
+    return start, min(end, entry.size - 1)
+
+
+async def image_response(request: Request, path: str, image_name: str, media_type: str | None = None,
+                         headers: dict | None = None) -> Response | None:
+    entry = await get_entry(path)
+    if entry is None:
+        return None
+    media_type = media_type or mimetypes.guess_type(path)[0]
+    headers = {
+        **(headers or {}),
+        'ETag': entry.etag,
+        'Last-Modified': entry.last_modified,
+        'Cache-Control': cache_control(image_name),
+        'Accept-Ranges': 'bytes',
+    }
+    if not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    if entry.body is None:
+        # Большие файлы отдаём с диска, Range обработает FileResponse
+        return FileResponse(path, media_type=media_type, headers=headers)
+    byte_range = parse_range(request, entry)
+    if byte_range is None:
+        return Response(entry.body, media_type=media_type, headers=headers)
+    start, end = byte_range
+    if start > end:
+        return Response(status_code=416, headers={'Content-Range': f'bytes */{entry.size}'})
+    headers['Content-Range'] = f'bytes {start}-{end}/{entry.size}'
+    return Response(entry.body[start:end + 1], status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,28 @@
+import csv
+import io
+from itertools import islice
+from typing import BinaryIO, Iterator
+from utils.enums import ImportFormat
+
+
+def detect_format(filename: str | None) -> ImportFormat:
+    if filename and filename.lower().endswith(('.ndjson', '.jsonl')):
+        return ImportFormat.NDJSON
+    return ImportFormat.CSV
+
+
+def read_rows(file: BinaryIO, import_format: ImportFormat) -> Iterator[tuple[int, dict | str]]:
+    # Файл читается построчно: (номер строки, dict для CSV или JSON-строка для NDJSON)
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    if import_format == ImportFormat.CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(text, 1):
+        if line.strip():
+            yield line_number, line
+
+
+def next_chunk(rows: Iterator, size: int) -> list:
+    return list(islice(rows, size))
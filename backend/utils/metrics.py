@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+from config.metrics import METRICS_COLLECT_INTERVAL, METRICS_LAG_INTERVAL
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+
+# Значения метрик создаются с учётом PROMETHEUS_MULTIPROC_DIR, поэтому переменная
+# должна быть задана до импорта модуля (config.metrics загружает .env раньше)
+MULTIPROCESS = 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+UNMATCHED_ROUTE = '<unmatched>'
+
+REQUESTS = Counter('http_requests_total', 'HTTP requests', ['method', 'route', 'status'])
+REQUEST_DURATION = Histogram('http_request_duration_seconds', 'HTTP request latency', ['method', 'route'],
+                             buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+REQUEST_EXCEPTIONS = Counter('http_request_exceptions_total', 'Unhandled exceptions while serving requests',
+                             ['method', 'route'])
+IN_PROGRESS = Gauge('http_requests_in_progress', 'HTTP requests being served', multiprocess_mode='livesum')
+
+POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections in use', ['engine'], multiprocess_mode='livesum')
+POOL_SIZE = Gauge('db_pool_size', 'Configured pool size', ['engine'], multiprocess_mode='livesum')
+POOL_OVERFLOW = Gauge('db_pool_overflow', 'Overflow connections open', ['engine'], multiprocess_mode='livesum')
+POOL_WAITS = Gauge('db_pool_checkout_waits', 'Checkouts that waited for a free connection', ['engine'],
+                   multiprocess_mode='livesum')
+POOL_TIMEOUTS = Gauge('db_pool_checkout_timeouts', 'Checkouts that timed out', ['engine'], multiprocess_mode='livesum')
+
+# Счётчики кэшей накоплены внутри процесса, поэтому это Gauge, а не Counter; доля попаданий -
+# hits / (hits + misses) в запросе PromQL
+CACHE_HITS = Gauge('cache_hits', 'Cache hits', ['cache'], multiprocess_mode='livesum')
+CACHE_MISSES = Gauge('cache_misses', 'Cache misses', ['cache'], multiprocess_mode='livesum')
+CACHE_SIZE = Gauge('cache_entries', 'Cache entries', ['cache'], multiprocess_mode='livesum')
+
+LOOP_LAG = Gauge('event_loop_lag_seconds', 'Max event loop lag over the last collection interval',
+                 multiprocess_mode='livemax')
+
+
+def route_template(scope) -> str:
+    # Шаблон маршрута (/api/books/{id}), а не сам путь: иначе число рядов не ограничено
+    route = scope.get('route')
+    return getattr(route, 'path', UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            REQUEST_EXCEPTIONS.labels(scope['method'], route_template(scope)).inc()
+            raise
+        finally:
+            IN_PROGRESS.dec()
+            route = route_template(scope)
+            REQUESTS.labels(scope['method'], route, str(status)).inc()
+            REQUEST_DURATION.labels(scope['method'], route).observe(time.perf_counter() - start)
+
+
+class MetricsCollector:
+    # Фоновая задача процесса: задержка event loop меряется часто, пул и кэши - раз в interval
+    def __init__(self, pool_stats, caches: dict, interval: float = METRICS_COLLECT_INTERVAL,
+                 lag_interval: float = METRICS_LAG_INTERVAL):
+        self.pool_stats = pool_stats
+        self.caches = caches
+        self.interval = interval
+        self.lag_interval = lag_interval
+
+    def collect(self):
+        for engine, stats in self.pool_stats().items():
+            POOL_CHECKED_OUT.labels(engine).set(stats['checked_out'])
+            POOL_SIZE.labels(engine).set(stats['pool_size'])
+            POOL_OVERFLOW.labels(engine).set(stats['overflow'])
+            POOL_WAITS.labels(engine).set(stats['wait_count'])
+            POOL_TIMEOUTS.labels(engine).set(stats['timeouts'])
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            CACHE_HITS.labels(name).set(stats['hits'])
+            CACHE_MISSES.labels(name).set(stats['misses'])
+            CACHE_SIZE.labels(name).set(stats['size'])
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        lag, next_collect = 0.0, 0.0
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(lag, loop.time() - start - self.lag_interval)
+            if loop.time() >= next_collect:
+                LOOP_LAG.set(lag)
+                self.collect()
+                lag, next_collect = 0.0, loop.time() + self.interval
+
+
+def render() -> bytes:
+    if not MULTIPROCESS:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def mark_process_dead():
+    # Убирает live-метрики завершившегося воркера из общего каталога
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
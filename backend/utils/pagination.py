@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+from datetime import date
+from fastapi import HTTPException, Response
+from utils.enums import Status
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+class Pagination:
+    """Параметры keyset-пагинации: limit, курсор и колонка сортировки ('-name' - по убыванию)."""
+
+    def __init__(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None, sort: str = 'id'):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.next_cursor = None
+
+    @property
+    def descending(self) -> bool:
+        return self.sort.startswith('-')
+
+    @property
+    def sort_field(self) -> str:
+        return self.sort.lstrip('-')
+
+
+def invalid_pagination(message: str):
+    return HTTPException(status_code=400, detail={'status': Status.FAILED.value, 'message': message})
+
+
+def encode_cursor(sort: str, value, id: int) -> str:
+    if isinstance(value, date):
+        value = value.isoformat()
+    payload = json.dumps({'sort': sort, 'value': value, 'id': id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str, python_type: type):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        value, id = payload['value'], int(payload['id'])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise invalid_pagination('Invalid cursor')
+    if payload.get('sort') != sort:
+        raise invalid_pagination('Cursor does not match sort order')
+    if python_type is date and value is not None:
+        value = date.fromisoformat(value)
+    return value, id
+
+
+def set_next_cursor(response: Response, pagination: Pagination | None):
+    if pagination and pagination.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = pagination.next_cursor
@@ -0,0 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+from config.auth import PASSWORD_HASH_ROUNDS, PASSWORD_HASH_WORKERS
+
+# Хеши с другим числом раундов считаются устаревшими и пересчитываются при входе
+password_context = CryptContext(
+    schemes=['pbkdf2_sha256'],
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=PASSWORD_HASH_ROUNDS,
+)
+
+# pbkdf2 отпускает GIL, поэтому потоки дают реальный параллелизм, а размер пула
+# ограничивает число одновременных вычислений; остальные запросы ждут в очереди
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash')
+
+
+async def run_in_password_executor(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(password_executor, fn, *args)
+
+
+async def hash_password(password: str) -> str:
+    return await run_in_password_executor(password_context.hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await run_in_password_executor(password_context.verify, password, password_hash)
+
+
+async def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, str | None]:
+    return await run_in_password_executor(password_context.verify_and_update, password, password_hash)
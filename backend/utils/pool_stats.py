@@ -0,0 +1,103 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    # Счётчики пула соединений, собираются из событий пула SQLAlchemy
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float, waited: bool, timed_out: bool = False):
+        with self.lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if waited:
+                self.wait_count += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self.lock:
+            requests = self.checkouts + self.timeouts
+            return {
+                'pool_size': pool.size(),
+                'max_overflow': pool._max_overflow,
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'wait_count': self.wait_count,
+                'timeouts': self.timeouts,
+                'avg_checkout_wait_ms': round(self.wait_total / requests * 1000, 3) if requests else 0.0,
+                'max_checkout_wait_ms': round(self.wait_max * 1000, 3),
+            }
+
+
+class TimedPoolMixin:
+    # Замеряет время получения соединения из пула; waited - свободных соединений не было
+    def connect(self):
+        stats = getattr(self, 'stats', None)
+        if stats is None:
+            return super().connect()
+        waited = self.checkedin() == 0 and self.checkedout() >= self.size() + self._max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            stats.record_wait(time.perf_counter() - start, waited, timed_out=True)
+            raise
+        stats.record_wait(time.perf_counter() - start, waited)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = getattr(self, 'stats', None)
+        return pool
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(pool) -> PoolStats:
+    stats = PoolStats()
+    pool.stats = stats
+
+    @event.listens_for(pool, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        with stats.lock:
+            stats.connects += 1
+
+    @event.listens_for(pool, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with stats.lock:
+            stats.checkouts += 1
+
+    @event.listens_for(pool, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        with stats.lock:
+            stats.checkins += 1
+
+    @event.listens_for(pool, 'invalidate')
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        with stats.lock:
+            stats.invalidations += 1
+
+    return stats
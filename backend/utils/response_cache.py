@@ -0,0 +1,79 @@
+import threading
+from collections import defaultdict
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from config.cache import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
+from config.compression import COMPRESSION_MIN_SIZE
+from utils.cache import TTLCache
+from utils.compression import compress, request_encoding
+from utils.pagination import Pagination, NEXT_CURSOR_HEADER
+from utils.serialization import dump_json
+
+
+class ResponseCache:
+    # Готовые JSON-ответы по ключу (сущность, версия, параметры запроса). Изменение сущности
+    # увеличивает её версию, и старые записи больше не находятся (их вытеснит LRU)
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generations = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def generation(self, entity: str) -> int:
+        with self.lock:
+            return self.generations[entity]
+
+    def bump(self, *entities: str):
+        with self.lock:
+            for entity in entities:
+                self.generations[entity] += 1
+
+    def get(self, entity: str, generation: int, params):
+        return self.cache.get((entity, generation, params))
+
+    def set(self, entity: str, generation: int, params, value):
+        self.cache.set((entity, generation, params), value)
+
+    def stats(self) -> dict:
+        with self.lock:
+            generations = dict(self.generations)
+        return {**self.cache.stats(), 'generations': generations}
+
+
+class CachedBody:
+    # Тело ответа и его сжатые варианты: каждая кодировка сжимается один раз на запись кэша
+    def __init__(self, body: bytes, next_cursor: str | None):
+        self.body = body
+        self.next_cursor = next_cursor
+        self.encoded = {}
+
+    def encode(self, encoding: str | None) -> tuple[bytes, str | None]:
+        if encoding is None or len(self.body) < COMPRESSION_MIN_SIZE:
+            return self.body, None
+        if encoding not in self.encoded:
+            self.encoded[encoding] = compress(self.body, encoding)
+        return self.encoded[encoding], encoding
+
+
+response_cache = ResponseCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+
+async def cached_response(entity: str, request: Request, pagination: Pagination | None, load,
+                          adapter: TypeAdapter) -> Response:
+    # Версия берётся до запроса в БД: если данные изменятся во время загрузки,
+    # ответ сохранится под старой версией и отдан уже не будет
+    generation = response_cache.generation(entity)
+    params = tuple(sorted(request.query_params.multi_items()))
+    entry = response_cache.get(entity, generation, params)
+    if entry is None:
+        entry = CachedBody(dump_json(adapter, await load()), pagination.next_cursor if pagination else None)
+        response_cache.set(entity, generation, params, entry)
+    # Уже сжатое тело middleware сжатия пропускает как есть
+    body, encoding = entry.encode(request_encoding(request.headers))
+    response = Response(content=body, media_type='application/json')
+    # Vary на каждом ответе: иначе кэш браузера или прокси отдаст несжатое тело клиенту с br и наоборот
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if entry.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = entry.next_cursor
+    return response
@@ -0,0 +1,12 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def dump_json(adapter: TypeAdapter, value) -> bytes:
+    # Весь результат проверяется по атрибутам ORM-объектов и сериализуется в pydantic-core
+    # за один вызов, без копий __dict__ и без повторного прохода jsonable_encoder
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def json_response(adapter: TypeAdapter, value, status_code: int = 200) -> Response:
+    return Response(content=dump_json(adapter, value), status_code=status_code, media_type='application/json')
@@ -0,0 +1,92 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+from config.profiling import SQL_PROFILE_SLOW_MS, SQL_PROFILE_N_PLUS_ONE
+
+logger = logging.getLogger(__name__)
+
+# Списки параметров IN (?, ?, ?) разной длины - один и тот же запрос
+IN_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)')
+QUERY_START = 'sql_profiler_start'
+
+
+class RequestProfile:
+    # Запросы к БД одного HTTP-запроса. Репозитории работают в пуле потоков, но ContextVar
+    # копируется туда вместе с контекстом, так что объект профиля общий
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.sql_time += seconds
+        self.shapes[IN_LIST.sub('(...)', ' '.join(statement.split()))] += 1
+
+    def repeated(self, threshold: int = SQL_PROFILE_N_PLUS_ONE) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar('current_profile', default=None)
+
+
+def instrument_engine(engine):
+    # Вне HTTP-запроса (фоновые задачи, CLI) профиля нет, и хуки ничего не делают
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_profile.get() is not None:
+            conn.info.setdefault(QUERY_START, []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        starts = conn.info.get(QUERY_START)
+        if profile is not None and starts:
+            profile.record(statement, time.perf_counter() - starts.pop())
+
+
+def server_timing(profile: RequestProfile, total: float) -> str:
+    return f'db;dur={profile.sql_time * 1000:.2f};desc="{profile.queries} queries", app;dur={total * 1000:.2f}'
+
+
+class SQLProfilerMiddleware:
+    # Чистый ASGI: заголовок добавляется в http.response.start, тело ответа не буферизуется.
+    # У потоковых ответов (экспорт) в заголовок попадают только запросы до начала отправки
+    def __init__(self, app, slow_ms: float = SQL_PROFILE_SLOW_MS, n_plus_one: int = SQL_PROFILE_N_PLUS_ONE):
+        self.app = app
+        self.slow_ms = slow_ms
+        self.n_plus_one = n_plus_one
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        start = time.perf_counter()
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', server_timing(profile, time.perf_counter() - start).encode()))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_profile.reset(token)
+            self.report(scope, status, profile, time.perf_counter() - start)
+
+    def report(self, scope, status: int | None, profile: RequestProfile, total: float):
+        path = f"{scope['method']} {scope['path']}"
+        if total * 1000 >= self.slow_ms:
+            logger.warning('Slow request %s -> %s: %.1f ms, %d queries, %.1f ms in SQL',
+                           path, status, total * 1000, profile.queries, profile.sql_time * 1000)
+        for shape, count in profile.repeated(self.n_plus_one):
+            logger.warning('Possible N+1 in %s: statement executed %d times: %.300s', path, count, shape)
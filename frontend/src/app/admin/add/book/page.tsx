@@ -51,9 +51,9 @@ export default function CreateBookPage() {
 
 
     useEffect(() => {
-        axios.get("http://127.0.0.1:8000/api/authors/").then(res => setAuthors(res.data));
-        axios.get("http://127.0.0.1:8000/api/publishers/").then(res => setPublishers(res.data));
-        axios.get("http://127.0.0.1:8000/api/genres/").then(res => setGenres(res.data));
+        axios.get("http://127.0.0.1:8000/api/authors/?all=true").then(res => setAuthors(res.data));
+        axios.get("http://127.0.0.1:8000/api/publishers/?all=true").then(res => setPublishers(res.data));
+        axios.get("http://127.0.0.1:8000/api/genres/?all=true").then(res => setGenres(res.data));
     }, []);
 
     const handleChange = (e: React.ChangeEvent<HTMLInputElement | HTMLTextAreaElement>) => {
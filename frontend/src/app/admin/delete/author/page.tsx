@@ -20,7 +20,7 @@ export default function AuthorsPage() {
 
   useEffect(() => {
     axios
-      .get<Author[]>(`${API_URL}authors/`)
+      .get<Author[]>(`${API_URL}authors/?all=true`)
       .then((response) => {
         setAuthors(response.data);
         setLoading(false);
@@ -45,7 +45,7 @@ export default function BooksPage() {
 
     const fetchBooks = async () => {
         try {
-            const { data } = await axios.get<Book[]>("http://127.0.0.1:8000/api/books/");
+            const { data } = await axios.get<Book[]>("http://127.0.0.1:8000/api/books/?all=true");
             setBooks(data);
         } catch (err) {
             toast.error("Ошибка", { description: "Не удалось загрузить книги" });
@@ -19,7 +19,7 @@ export default function PublishersPage() {
   const [selectedPublisher, setSelectedPublisher] = useState<Publisher | null>(null);
 
   useEffect(() => {
-    axios.get<Publisher[]>(`${API_URL}publishers/`)
+    axios.get<Publisher[]>(`${API_URL}publishers/?all=true`)
       .then((response) => {
         setPublishers(response.data);
       })
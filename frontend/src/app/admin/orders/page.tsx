@@ -51,7 +51,7 @@ export default function OrdersPage() {
   useEffect(() => {
     const token = localStorage.getItem("authToken");
 
-    axios.get("http://127.0.0.1:8000/api/orders/", {
+    axios.get("http://127.0.0.1:8000/api/orders/?all=true", {
       headers: {
         Authorization: `Bearer ${token}`,
       },
@@ -89,7 +89,7 @@ export default function OrdersPage() {
         }
       );
   
-      const response = await axios.get("http://127.0.0.1:8000/api/orders/", {
+      const response = await axios.get("http://127.0.0.1:8000/api/orders/?all=true", {
         headers: {
           Authorization: `Bearer ${token}`,
         },
@@ -24,7 +24,7 @@ export default function AuthorsList() {
 
   useEffect(() => {
     axios
-      .get<Author[]>(`${API_URL}authors/`)
+      .get<Author[]>(`${API_URL}authors/?all=true`)
       .then((response) => setAuthors(response.data))
       .catch((error) => console.log("Ошибка загрузки авторов:", error))
       .finally(() => setLoading(false));
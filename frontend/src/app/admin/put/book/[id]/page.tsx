@@ -90,13 +90,13 @@ export default function EditBookPage() {
 
     const fetchOtherData = async () => {
         try {
-            const authorsData = await axios.get<Author[]>("http://127.0.0.1:8000/api/authors/");
+            const authorsData = await axios.get<Author[]>("http://127.0.0.1:8000/api/authors/?all=true");
             setAuthors(authorsData.data);
 
-            const publishersData = await axios.get<Publisher[]>("http://127.0.0.1:8000/api/publishers/");
+            const publishersData = await axios.get<Publisher[]>("http://127.0.0.1:8000/api/publishers/?all=true");
             setPublishers(publishersData.data);
 
-            const genresData = await axios.get<Genre[]>("http://127.0.0.1:8000/api/genres/");
+            const genresData = await axios.get<Genre[]>("http://127.0.0.1:8000/api/genres/?all=true");
             setGenres(genresData.data);
         } catch (error) {
             console.log("Ошибка загрузки дополнительных данных:", error);
@@ -47,7 +47,7 @@ export default function BooksPage() {
 
     const fetchBooks = async () => {
         setLoading(true);
-        const { data } = await axios.get<Book[]>("http://127.0.0.1:8000/api/books/ ");
+        const { data } = await axios.get<Book[]>("http://127.0.0.1:8000/api/books/?all=true");
         setBooks(data);
         setLoading(false);
     };
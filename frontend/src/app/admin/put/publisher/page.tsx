@@ -24,7 +24,7 @@ export default function PublishersPage() {
 
   useEffect(() => {
     axios
-      .get<Publisher[]>(`${API_URL}publishers/`)
+      .get<Publisher[]>(`${API_URL}publishers/?all=true`)
       .then((response) => {
         setPublishers(response.data);
         setLoading(false);
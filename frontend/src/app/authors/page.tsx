@@ -16,7 +16,7 @@ type Author = {
 export default function AuthorsPage() {
   const [authors, setAuthors] = useState<Author[]>([]);
   useEffect(() => {
-    axios.get<Author[]>(`${API_URL}authors/`)
+    axios.get<Author[]>(`${API_URL}authors/?all=true`)
       .then(response => setAuthors(response.data))
       .catch(error => console.error("Ошибка загрузки авторов:", error));
   }, []);
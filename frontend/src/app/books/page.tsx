@@ -76,7 +76,7 @@ export default function BooksPage() {
   const [selectedBook, setSelectedBook] = useState<GroupedBook | null>(null);
 
   useEffect(() => {
-    axios.get<Book[]>(`${API_URL}books/`)
+    axios.get<Book[]>(`${API_URL}books/?all=true`)
       .then(response => {
         setBooks(response.data);
         setLoading(false);
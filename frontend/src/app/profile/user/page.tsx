@@ -111,7 +111,7 @@ export default function UserProfile() {
   useEffect(() => {
     const token = localStorage.getItem("authToken");
     axios
-      .get(`http://127.0.0.1:8000/api/orders/`, {
+      .get(`http://127.0.0.1:8000/api/orders/?all=true`, {
         headers: { Authorization: `Bearer ${token}` },
         withCredentials: true,
       })
@@ -17,7 +17,7 @@ export default function PublishersPage() {
   const router = useRouter();
 
   useEffect(() => {
-    axios.get<Publisher[]>("http://127.0.0.1:8000/api/publishers/")
+    axios.get<Publisher[]>("http://127.0.0.1:8000/api/publishers/?all=true")
       .then((response) => {
         setPublishers(response.data);
       })